@@ -0,0 +1,53 @@
+"""
+File Name: bench_construction.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from shapely.geometry import Point, LineString, box
+from cell import Cell
+from connection import Connection
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare checked and unchecked model construction.')
+    parser.add_argument('-n', '--count', type=int, default=200000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    ids = [f'c{i}' for i in range(args.count)]
+    space, node = box(0, 0, 1, 1), Point(0.5, 0.5)
+    bound, edge = LineString([(1, 0), (1, 1)]), LineString([(0.5, 0.5), (1.5, 0.5)])
+    cases = {
+        'Cell': (lambda: [Cell(i, {}, space, node) for i in ids],
+                 lambda: [Cell.unchecked(i, {}, space, node) for i in ids]),
+        'Connection': (lambda: [Connection(i, {}, i, i, bound, edge) for i in ids],
+                       lambda: [Connection.unchecked(i, {}, i, i, bound, edge) for i in ids])
+    }
+    for name, (checked, unchecked) in cases.items():
+        checked_time = best_of(checked, args.repeat)
+        unchecked_time = best_of(unchecked, args.repeat)
+        print(f'{name:<10} {args.count} objects: checked {checked_time:.3f}s, unchecked {unchecked_time:.3f}s, '
+              f'speedup {checked_time / unchecked_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
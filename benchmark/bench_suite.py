@@ -0,0 +1,133 @@
+"""
+File Name: bench_suite.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import argparse
+import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import shapely
+from indoorspace import IndoorSpace
+from synthetic import synthetic_building
+from visualization import graph_visualize, hypergraph_visualize
+
+SIZES = (1000, 10000, 100000, 1000000)
+
+
+def _rebuild(indoorSpace: IndoorSpace):
+    rebuilt = IndoorSpace()
+    for cell in indoorSpace.cells:
+        rebuilt.add_cell(cell)
+    for connection in indoorSpace.connections:
+        rebuilt.add_connection(connection)
+
+
+def _cold_hypergraph(indoorSpace: IndoorSpace):
+    indoorSpace.set_hypergraph(indoorSpace.hypergraph)
+
+
+def cases(indoorSpace: IndoorSpace, directory: str, max_visualize: int, max_dense: int):
+    json_str = json.dumps(indoorSpace.to_json())
+    yield 'add_cell_connection', None, lambda: _rebuild(indoorSpace)
+    yield 'to_json', None, indoorSpace.to_json
+    yield 'to_json_dumps', None, lambda: json.dumps(indoorSpace.to_json())
+    yield 'from_json', None, lambda: IndoorSpace.from_json(json_str)
+    yield 'get_incident_matrix', None, indoorSpace.get_incident_matrix
+    if len(indoorSpace.cells) <= max_dense:
+        yield 'get_incident_matrix_dense', None, lambda: indoorSpace.get_incident_matrix(sparse=False)
+    yield 'get_hypergraph', lambda: _cold_hypergraph(indoorSpace), indoorSpace.get_hypergraph
+    if len(indoorSpace.cells) <= max_visualize:
+        yield 'graph_visualize', None, lambda: graph_visualize(
+            indoorSpace, os.path.join(directory, 'graph.html'), auto_open=False)
+        yield 'hypergraph_visualize', None, lambda: hypergraph_visualize(
+            indoorSpace, os.path.join(directory, 'hypergraph.html'), auto_open=False)
+    yield 'graph_visualize_batched', None, lambda: graph_visualize(
+        indoorSpace, os.path.join(directory, 'graph.html'), auto_open=False, batched=True)
+    yield 'hypergraph_visualize_batched', None, lambda: hypergraph_visualize(
+        indoorSpace, os.path.join(directory, 'hypergraph.html'), auto_open=False, batched=True)
+
+
+def measure(setup, func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def write(output, name: str, shape: dict, timings: list, env: dict):
+    record = {'case': name, **shape, 'repeat': len(timings), 'min': min(timings),
+              'mean': sum(timings) / len(timings), 'max': max(timings), **env}
+    output.write(json.dumps(record) + '\n')
+    output.flush()
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'shapely': shapely.__version__,
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark IndoorSpace operations on synthetic buildings. '
+                                                 'Every measurement is written as one JSON line.')
+    parser.add_argument('-s', '--sizes', default=','.join(map(str, SIZES)),
+                        help='comma separated cell counts')
+    parser.add_argument('-k', '--kind', choices=['grid', 'corridor'], default='grid')
+    parser.add_argument('--floors', type=int, default=4)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('-c', '--case', action='append', help='run only the named cases')
+    parser.add_argument('-o', '--output', help='append results to this file instead of stdout')
+    parser.add_argument('--max-visualize', type=int, default=2000,
+                        help='largest building that is rendered by the per-element visualizations')
+    parser.add_argument('--max-dense', type=int, default=10000,
+                        help='largest building for the dense incident matrix')
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    env = environment()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for size in (int(size) for size in args.sizes.split(',')):
+                start = time.perf_counter()
+                indoorSpace = synthetic_building(size, args.kind, args.floors)
+                generated = time.perf_counter() - start
+                shape = {
+                    'kind': args.kind,
+                    'size': size,
+                    'cells': len(indoorSpace.cells),
+                    'connections': len(indoorSpace.connections),
+                    'layers': len(indoorSpace.layers),
+                    'rlineses': len(indoorSpace.rlineses)
+                }
+                write(output, 'generate', shape, [generated], env)
+                for name, setup, func in cases(indoorSpace, directory, args.max_visualize, args.max_dense):
+                    if args.case and name not in args.case:
+                        continue
+                    write(output, name, shape, measure(setup, func, args.repeat), env)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
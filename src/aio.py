@@ -0,0 +1,98 @@
+"""
+File Name: aio.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor
+from functools import partial
+from typing import List, Optional, Callable, Any
+from indoorspace import IndoorSpace
+from streaming import stream_deserialization, CHUNK_SIZE
+from cancellation import LoadCancelled
+
+Progress = Callable[[int, int], None]
+
+
+async def _run(function: Callable[[], Any], cancel: threading.Event, executor: Optional[Executor]) -> Any:
+    future = asyncio.get_running_loop().run_in_executor(executor, function)
+    try:
+        return await future
+    except asyncio.CancelledError:
+        # the worker thread cannot be interrupted, so it is told to stop at its next chunk
+        cancel.set()
+        raise
+
+
+def _on_loop(progress: Optional[Progress], cancel: threading.Event) -> Optional[Progress]:
+    if progress is None:
+        return None
+    loop = asyncio.get_running_loop()
+
+    def post(done: int, total: int):
+        # a cancelled load can outlive its loop, so late reports are dropped
+        if cancel.is_set() or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(progress, done, total)
+        except RuntimeError:
+            pass
+    return post
+
+
+async def deserialization_async(filepath: str, lazy: bool = False, layer_ids: Optional[List[str]] = None,
+                                progress: Optional[Progress] = None, cancel: Optional[threading.Event] = None,
+                                executor: Optional[Executor] = None, chunk_size: int = CHUNK_SIZE) -> IndoorSpace:
+    cancel = threading.Event() if cancel is None else cancel
+    load = partial(stream_deserialization, filepath, chunk_size, lazy, layer_ids, _on_loop(progress, cancel), cancel)
+    return await _run(load, cancel, executor)
+
+
+async def from_json_async(json_str: str, lazy: bool = False, progress: Optional[Progress] = None,
+                          cancel: Optional[threading.Event] = None,
+                          executor: Optional[Executor] = None) -> IndoorSpace:
+    cancel = threading.Event() if cancel is None else cancel
+    load = partial(IndoorSpace.from_json, json_str, lazy, _on_loop(progress, cancel), cancel)
+    return await _run(load, cancel, executor)
+
+
+class LiveIndoorSpace:
+
+    def __init__(self, indoorspace: Optional[IndoorSpace] = None):
+        self._current: Optional[IndoorSpace] = indoorspace
+        self._cancel: Optional[threading.Event] = None
+
+    @property
+    def current(self) -> Optional[IndoorSpace]:
+        return self._current
+
+    @property
+    def loading(self) -> bool:
+        return self._cancel is not None
+
+    def cancel(self):
+        if self._cancel is not None:
+            self._cancel.set()
+
+    async def reload(self, filepath: str, lazy: bool = False, layer_ids: Optional[List[str]] = None,
+                     progress: Optional[Progress] = None, prepare: Optional[Callable[[IndoorSpace], Any]] = None,
+                     executor: Optional[Executor] = None) -> IndoorSpace:
+        # a newer reload supersedes the one still in flight
+        self.cancel()
+        cancel = self._cancel = threading.Event()
+        try:
+            indoorspace = await deserialization_async(filepath, lazy, layer_ids, progress, cancel, executor)
+            if prepare is not None:
+                await _run(partial(prepare, indoorspace), cancel, executor)
+        finally:
+            if self._cancel is cancel:
+                self._cancel = None
+        if cancel.is_set():
+            raise LoadCancelled('Loading was cancelled')
+        # readers keep whichever model they fetched, the swap is a single reference assignment on the loop
+        self._current = indoorspace
+        return indoorspace
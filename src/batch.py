@@ -0,0 +1,175 @@
+"""
+File Name: batch.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Iterator, Optional, Callable
+from indoorspace import IndoorSpace
+from serialization import stream_serialization
+from streaming import stream_deserialization
+from binary import binary_serialization, binary_deserialization
+from validation import validate
+
+BINARY_EXTENSION = '.ijb'
+
+WRITERS = {
+    'json': ('.json', stream_serialization),
+    'binary': (BINARY_EXTENSION, binary_serialization)
+}
+
+
+class BatchResult:
+
+    __slots__ = ('filepath', 'indoorspace', 'output', 'cells', 'connections', 'seconds', 'error')
+
+    def __init__(self, filepath: str, indoorspace: Optional[IndoorSpace] = None, output: Optional[str] = None,
+                 cells: int = 0, connections: int = 0, seconds: float = 0.0, error: Optional[str] = None):
+        self.filepath = filepath
+        self.indoorspace = indoorspace
+        self.output = output
+        self.cells = cells
+        self.connections = connections
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def load(filepath: str, lazy: bool = False) -> IndoorSpace:
+    if filepath.endswith(BINARY_EXTENSION):
+        return binary_deserialization(filepath, lazy)
+    return stream_deserialization(filepath, lazy=lazy)
+
+
+def _run(task: Callable, filepath: str, *args) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        result = task(filepath, *args)
+    except Exception as error:
+        result = BatchResult(filepath, error=f'{type(error).__name__}: {error}')
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _load_task(filepath: str, lazy: bool) -> BatchResult:
+    indoorSpace = load(filepath, lazy)
+    return BatchResult(filepath, indoorspace=indoorSpace, cells=len(indoorSpace.cells),
+                       connections=len(indoorSpace.connections))
+
+
+def _validate_task(filepath: str) -> BatchResult:
+    indoorSpace = load(filepath)
+    report = validate(indoorSpace)
+    error = None if report.ok else f'{len(report.issues)} validation issues {report.counts()}'
+    return BatchResult(filepath, cells=len(indoorSpace.cells), connections=len(indoorSpace.connections), error=error)
+
+
+def _output_path(filepath: str, output_dir: str, target_format: str) -> str:
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(filepath))[0] + WRITERS[target_format][0])
+
+
+def _check_outputs(filepaths: List[str], output_dir: str, target_format: str):
+    inputs = {os.path.realpath(filepath) for filepath in filepaths}
+    seen = {}
+    for filepath in filepaths:
+        output = os.path.realpath(_output_path(filepath, output_dir, target_format))
+        if output in inputs:
+            raise ValueError(f'Converting {filepath} would overwrite an input file: {output}')
+        if output in seen:
+            raise ValueError(f'{seen[output]} and {filepath} would both be written to {output}')
+        seen[output] = filepath
+
+
+def _convert_task(filepath: str, output_dir: str, target_format: str) -> BatchResult:
+    indoorSpace = load(filepath)
+    output = _output_path(filepath, output_dir, target_format)
+    WRITERS[target_format][1](output, indoorSpace)
+    return BatchResult(filepath, output=output, cells=len(indoorSpace.cells),
+                       connections=len(indoorSpace.connections))
+
+
+def _map(task: Callable, filepaths: List[str], args: tuple, processes: Optional[int],
+         max_pending: Optional[int]) -> Iterator[BatchResult]:
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for filepath in filepaths:
+            yield _run(task, filepath, *args)
+        return
+    max_pending = max_pending or 2 * processes
+    filepaths = iter(filepaths)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = set()
+        while True:
+            for filepath in filepaths:
+                pending.add(executor.submit(_run, task, filepath, *args))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def batch_deserialization(filepaths: List[str], processes: Optional[int] = None, max_pending: Optional[int] = None,
+                          lazy: bool = False) -> Iterator[BatchResult]:
+    return _map(_load_task, filepaths, (lazy,), processes, max_pending)
+
+
+def batch_validate(filepaths: List[str], processes: Optional[int] = None,
+                   max_pending: Optional[int] = None) -> Iterator[BatchResult]:
+    return _map(_validate_task, filepaths, (), processes, max_pending)
+
+
+def batch_convert(filepaths: List[str], output_dir: str, target_format: str = 'binary',
+                  processes: Optional[int] = None, max_pending: Optional[int] = None) -> Iterator[BatchResult]:
+    if target_format not in WRITERS:
+        raise ValueError('Unknown target format: ' + str(target_format))
+    # outputs are named after the input's basename, so clashes are rejected before anything is written
+    filepaths = list(filepaths)
+    _check_outputs(filepaths, output_dir, target_format)
+    os.makedirs(output_dir, exist_ok=True)
+    return _map(_convert_task, filepaths, (output_dir, target_format), processes, max_pending)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load, validate and convert IndoorJSON files in parallel.')
+    parser.add_argument('command', choices=['validate', 'convert'])
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('-o', '--output-dir', default='.')
+    parser.add_argument('-f', '--format', choices=sorted(WRITERS), default='binary')
+    parser.add_argument('-j', '--processes', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        try:
+            results = batch_convert(args.files, args.output_dir, args.format, args.processes)
+        except ValueError as error:
+            parser.error(str(error))
+    else:
+        results = batch_validate(args.files, args.processes)
+
+    failures = 0
+    for result in results:
+        if result.ok:
+            target = f' -> {result.output}' if result.output else ''
+            print(f'ok {result.filepath}{target} ({result.cells} cells, {result.connections} connections, '
+                  f'{result.seconds:.2f}s)')
+        else:
+            failures += 1
+            print(f'error {result.filepath}: {result.error}', file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
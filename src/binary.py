@@ -0,0 +1,280 @@
+"""
+File Name: binary.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import json
+import struct
+import numpy as np
+import shapely
+from typing import List, Dict, Tuple, Optional
+from cell import Cell
+from connection import Connection
+from layer import Layer
+from rlines import Rlines
+from indoorspace import IndoorSpace
+
+MAGIC = b'IJSONBIN'
+VERSION = 1
+ALIGNMENT = 8
+
+_PREAMBLE = struct.Struct('<8sIQ')
+
+
+class StringTable:
+
+    def __init__(self, strings: List[str] = None):
+        self._strings: List[str] = []
+        self._index: Dict[str, int] = {}
+        for string in strings or []:
+            self.intern(string)
+
+    @property
+    def strings(self) -> List[str]:
+        return self._strings
+
+    def intern(self, string: str) -> int:
+        index = self._index.get(string)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(string)
+            self._index[string] = index
+        return index
+
+    def intern_all(self, strings: List[str]) -> np.ndarray:
+        return np.fromiter((self.intern(string) for string in strings), dtype=np.uint32, count=len(strings))
+
+
+def _json_bytes(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _pack_bytes(chunks: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(chunks) + 1, dtype=np.uint64)
+    np.cumsum([len(chunk) for chunk in chunks], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(chunks), dtype=np.uint8)
+
+
+def unpack_bytes(offsets: np.ndarray, data: np.ndarray, indices: Optional[np.ndarray] = None) -> List[bytes]:
+    if indices is not None:
+        # a selection only copies its own slices out of the (possibly mapped) data section
+        return [data[start:end].tobytes() for start, end in zip(offsets[indices].tolist(),
+                                                                offsets[indices + 1].tolist())]
+    bounds = offsets.tolist()
+    buffer = data.tobytes()
+    return [buffer[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _pack_lists(lists: List[List[str]], strings: StringTable) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(lists) + 1, dtype=np.uint64)
+    np.cumsum([len(items) for items in lists], out=offsets[1:])
+    data = strings.intern_all([item for items in lists for item in items])
+    return offsets, data
+
+
+def unpack_lists(offsets: np.ndarray, data: np.ndarray, strings: List[str],
+                 indices: Optional[np.ndarray] = None) -> List[List[str]]:
+    if indices is not None:
+        return [[strings[index] for index in data[start:end].tolist()]
+                for start, end in zip(offsets[indices].tolist(), offsets[indices + 1].tolist())]
+    bounds = offsets.tolist()
+    items = [strings[index] for index in data.tolist()]
+    return [items[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _pack_properties(sections: Dict, prefix: str, properties: List[Dict], strings: StringTable):
+    sections[prefix + '.properties.offsets'], sections[prefix + '.properties.keys'] = \
+        _pack_lists([list(item) for item in properties], strings)
+    sections[prefix + '.properties.values.offsets'], sections[prefix + '.properties.values.data'] = \
+        _pack_bytes([_json_bytes(value) for item in properties for value in item.values()])
+
+
+def unpack_properties(sections: Dict, prefix: str, strings: List[str],
+                      indices: Optional[np.ndarray] = None) -> List[Dict]:
+    offsets = sections[prefix + '.properties.offsets']
+    keys = unpack_lists(offsets, sections[prefix + '.properties.keys'], strings, indices)
+    if indices is not None:
+        # values are stored flat in key order, so the key offsets also locate each element's values
+        starts = offsets[indices].astype(np.int64)
+        counts = offsets[indices + 1].astype(np.int64) - starts
+        indices = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    values = iter(unpack_bytes(sections[prefix + '.properties.values.offsets'],
+                               sections[prefix + '.properties.values.data'], indices))
+    return [{key: json.loads(next(values)) for key in item} for item in keys]
+
+
+def _pack_geometries(sections: Dict, name: str, geometries: List):
+    wkb = shapely.to_wkb(np.array(geometries, dtype=object)) if geometries else []
+    sections[name + '.offsets'], sections[name + '.data'] = _pack_bytes(list(wkb))
+
+
+def _unpack_geometries(sections: Dict, name: str, lazy: bool = False, indices: Optional[np.ndarray] = None) -> List:
+    wkb = unpack_bytes(sections[name + '.offsets'], sections[name + '.data'], indices)
+    if lazy or not wkb:
+        return wkb
+    return shapely.from_wkb(np.array(wkb, dtype=object)).tolist()
+
+
+def pack(indoorspace: IndoorSpace) -> Dict[str, np.ndarray]:
+    strings = StringTable()
+    sections = {'properties': np.frombuffer(_json_bytes(indoorspace.properties), dtype=np.uint8)}
+
+    cells = indoorspace.cells
+    sections['cells.id'] = strings.intern_all([cell.id for cell in cells])
+    _pack_properties(sections, 'cells', [cell.properties for cell in cells], strings)
+    _pack_geometries(sections, 'cells.space', [cell.space for cell in cells])
+    _pack_geometries(sections, 'cells.node', [cell.node for cell in cells])
+
+    connections = indoorspace.connections
+    sections['connections.id'] = strings.intern_all([connection.id for connection in connections])
+    _pack_properties(sections, 'connections', [connection.properties for connection in connections], strings)
+    sections['connections.fr'] = strings.intern_all([connection.source for connection in connections])
+    sections['connections.to'] = strings.intern_all([connection.target for connection in connections])
+    _pack_geometries(sections, 'connections.bound', [connection.bound for connection in connections])
+    _pack_geometries(sections, 'connections.edge', [connection.edge for connection in connections])
+
+    layers = indoorspace.layers
+    sections['layers.id'] = strings.intern_all([layer.id for layer in layers])
+    sections['layers.cells.offsets'], sections['layers.cells.data'] = \
+        _pack_lists([layer.cells for layer in layers], strings)
+
+    rlineses = indoorspace.rlineses
+    sections['rlineses.id'] = strings.intern_all([rlines.id for rlines in rlineses])
+    sections['rlineses.cell'] = strings.intern_all([rlines.cell for rlines in rlineses])
+    sections['rlineses.ins.offsets'], sections['rlineses.ins.data'] = \
+        _pack_lists([rlines.ins for rlines in rlineses], strings)
+    sections['rlineses.outs.offsets'], sections['rlineses.outs.data'] = \
+        _pack_lists([rlines.outs for rlines in rlineses], strings)
+    sections['rlineses.closure.offsets'], sections['rlineses.closure.data'] = \
+        _pack_bytes([_json_bytes(rlines.closure) for rlines in rlineses])
+
+    sections['strings.offsets'], sections['strings.data'] = \
+        _pack_bytes([string.encode('utf-8') for string in strings.strings])
+    return sections
+
+
+def _select(sections: Dict[str, np.ndarray], layer_ids: List[str], strings: List[str]) -> Tuple:
+    # ids are compared as string table indices, so nothing outside the selection is decoded
+    string_index = {string: index for index, string in enumerate(strings)}
+    wanted = np.array([string_index.get(layer_id, -1) for layer_id in layer_ids], dtype=np.int64)
+    layers = np.flatnonzero(np.isin(sections['layers.id'], wanted))
+    found = {strings[index] for index in sections['layers.id'][layers].tolist()}
+    missing = [layer_id for layer_id in layer_ids if layer_id not in found]
+    if missing:
+        raise ValueError('Layer id does not exist: ' + ', '.join(map(str, missing)))
+    bounds = sections['layers.cells.offsets'].tolist()
+    data = sections['layers.cells.data']
+    selected = np.unique(np.concatenate([data[bounds[i]:bounds[i + 1]] for i in layers.tolist()] or
+                                        [np.empty(0, dtype=data.dtype)]))
+    cells = np.flatnonzero(np.isin(sections['cells.id'], selected))
+    inside = np.isin(sections['connections.fr'], selected).astype(np.int8) + \
+        np.isin(sections['connections.to'], selected)
+    rlineses = np.flatnonzero(np.isin(sections['rlineses.cell'], selected))
+    return layers, cells, np.flatnonzero(inside == 2), np.flatnonzero(inside == 1), rlineses
+
+
+def unpack(sections: Dict[str, np.ndarray], lazy: bool = False, trusted: bool = False,
+           layer_ids: Optional[List[str]] = None) -> IndoorSpace:
+    strings = [item.decode('utf-8') for item in unpack_bytes(sections['strings.offsets'], sections['strings.data'])]
+    indoorSpace = IndoorSpace()
+    indoorSpace.set_properties(json.loads(sections['properties'].tobytes()))
+    if layer_ids is None:
+        layers = cells = connections = stubs = rlineses = None
+    else:
+        layers, cells, connections, stubs, rlineses = _select(sections, layer_ids, strings)
+
+    def ids(name: str, indices: Optional[np.ndarray]) -> List[str]:
+        section = sections[name] if indices is None else sections[name][indices]
+        return [strings[index] for index in section.tolist()]
+
+    cell_ids = ids('cells.id', cells)
+    cell_properties = unpack_properties(sections, 'cells', strings, cells)
+    spaces = _unpack_geometries(sections, 'cells.space', lazy, cells)
+    nodes = _unpack_geometries(sections, 'cells.node', lazy, cells)
+    make_cell = Cell.unchecked if trusted else Cell.from_raw if lazy else Cell
+    for cell_id, properties, space, node in zip(cell_ids, cell_properties, spaces, nodes):
+        indoorSpace.add_cell(make_cell(cell_id, properties, space, node))
+
+    make_connection = Connection.unchecked if trusted else Connection.from_raw if lazy else Connection
+    groups = [(connections, indoorSpace.add_connection)]
+    if stubs is not None:
+        groups.append((stubs, indoorSpace.add_stub))
+    for indices, add in groups:
+        connection_ids = ids('connections.id', indices)
+        connection_properties = unpack_properties(sections, 'connections', strings, indices)
+        sources = ids('connections.fr', indices)
+        targets = ids('connections.to', indices)
+        bounds = _unpack_geometries(sections, 'connections.bound', lazy, indices)
+        edges = _unpack_geometries(sections, 'connections.edge', lazy, indices)
+        for connection_id, properties, fr, to, bound, edge in zip(connection_ids, connection_properties,
+                                                                  sources, targets, bounds, edges):
+            add(make_connection(connection_id, properties, fr, to, bound, edge))
+
+    layer_cells = unpack_lists(sections['layers.cells.offsets'], sections['layers.cells.data'], strings, layers)
+    make_layer = Layer.unchecked if trusted else Layer
+    for layer_id, members in zip(ids('layers.id', layers), layer_cells):
+        indoorSpace.set_layers(make_layer(layer_id, members))
+
+    rlines_ids = ids('rlineses.id', rlineses)
+    rlines_cells = ids('rlineses.cell', rlineses)
+    ins = unpack_lists(sections['rlineses.ins.offsets'], sections['rlineses.ins.data'], strings, rlineses)
+    outs = unpack_lists(sections['rlineses.outs.offsets'], sections['rlineses.outs.data'], strings, rlineses)
+    closures = [json.loads(item) for item in unpack_bytes(sections['rlineses.closure.offsets'],
+                                                          sections['rlineses.closure.data'], rlineses)]
+    make_rlines = Rlines.unchecked if trusted else Rlines
+    stub_ids = {stub.id for stub in indoorSpace.stubs}
+    for rlines in zip(rlines_ids, rlines_cells, ins, outs, closures):
+        indoorSpace.set_rlineses(make_rlines(*rlines).without(stub_ids))
+
+    return indoorSpace
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_sections(file, sections: Dict[str, np.ndarray]):
+    toc = {}
+    offset = 0
+    for name, array in sections.items():
+        offset = _aligned(offset)
+        toc[name] = [offset, array.dtype.str, len(array)]
+        offset += array.nbytes
+    header = json.dumps(toc, separators=(',', ':')).encode('utf-8')
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    file.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+    file.write(header)
+    position = _PREAMBLE.size + len(header)
+    for name, array in sections.items():
+        start = data_start + toc[name][0]
+        file.write(b'\0' * (start - position))
+        file.write(np.ascontiguousarray(array).tobytes())
+        position = start + array.nbytes
+
+
+def read_sections(buffer) -> Dict[str, np.ndarray]:
+    magic, version, header_length = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError('Not a binary IndoorJSON file')
+    if version != VERSION:
+        raise ValueError(f'Unsupported binary IndoorJSON version {version}')
+    toc = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+    data_start = _aligned(_PREAMBLE.size + header_length)
+    return {name: np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=data_start + offset)
+            for name, (offset, dtype, count) in toc.items()}
+
+
+def binary_serialization(filepath: str, indoorspace: IndoorSpace):
+    with open(filepath, 'wb') as file:
+        write_sections(file, pack(indoorspace))
+
+
+def binary_deserialization(filepath: str, lazy: bool = False, trusted: bool = False,
+                           layer_ids: Optional[List[str]] = None) -> IndoorSpace:
+    with open(filepath, 'rb') as file:
+        buffer = file.read()
+    return unpack(read_sections(buffer), lazy, trusted, layer_ids)
@@ -0,0 +1,11 @@
+"""
+File Name: cancellation.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+
+class LoadCancelled(Exception):
+    pass
@@ -8,10 +8,13 @@ Create Date: 2024/3/14
 """
 
 import json
+import numpy as np
 from functools import wraps
-from typing import Dict
+from typing import Dict, List, Union
+from shapely import from_wkt, from_wkb
 from shapely.wkt import loads
 from shapely.geometry.base import BaseGeometry
+from instrumentation import phase
 
 
 def type_check(func):
@@ -29,8 +32,24 @@ def type_check(func):
     return wrapper
 
 
+def raw_geometry(raw: Union[str, bytes]) -> BaseGeometry:
+    if isinstance(raw, bytes):
+        return from_wkb(raw)
+    return loads(raw)
+
+
+def geometry_wkt(value: Union[BaseGeometry, str, bytes]) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        return from_wkb(value).wkt
+    return value.wkt
+
+
 class Cell:
 
+    __slots__ = ('__id', '__properties', '__space', '__node')
+
     @type_check
     def __init__(self, cell_id: str, properties: Dict, space: BaseGeometry, node: BaseGeometry):
         self.__id: str = cell_id
@@ -48,28 +67,58 @@ class Cell:
 
     @property
     def space(self) -> BaseGeometry:
+        if not isinstance(self.__space, BaseGeometry):
+            self.__space = raw_geometry(self.__space)
         return self.__space
 
     @property
     def node(self) -> BaseGeometry:
+        if not isinstance(self.__node, BaseGeometry):
+            self.__node = raw_geometry(self.__node)
         return self.__node
 
     def to_json(self) -> Dict:
-        result = {}
-        for key, value in self.__dict__.items():
-            json_key = key.split('__')[-1]
-            if isinstance(value, BaseGeometry):
-                result[json_key] = value.wkt
-            elif json_key == 'id':
-                json_key = '$id'
-                result[json_key] = value
-            else:
-                result[json_key] = value
-        return result
+        return {
+            '$id': self.__id,
+            'properties': self.__properties,
+            'space': geometry_wkt(self.__space),
+            'node': geometry_wkt(self.__node)
+        }
+
+    @classmethod
+    def from_raw(cls, cell_id: str, properties: Dict, space: Union[str, bytes], node: Union[str, bytes]) -> 'Cell':
+        if not isinstance(cell_id, str):
+            raise TypeError("cell_id must be a string")
+        if not isinstance(properties, dict):
+            raise TypeError("properties must be a dictionary")
+        if not isinstance(space, (str, bytes)):
+            raise TypeError("space must be a WKT string or WKB bytes")
+        if not isinstance(node, (str, bytes)):
+            raise TypeError("node must be a WKT string or WKB bytes")
+        return cls.unchecked(cell_id, properties, space, node)
+
+    @classmethod
+    def unchecked(cls, cell_id: str, properties: Dict, space, node) -> 'Cell':
+        cell = cls.__new__(cls)
+        cell.__id = cell_id
+        cell.__properties = properties
+        cell.__space = space
+        cell.__node = node
+        return cell
+
+    @classmethod
+    def from_json(cls, json_dict: Dict, lazy: bool = False) -> 'Cell':
+        if lazy:
+            return cls.from_raw(json_dict['$id'], json_dict['properties'], json_dict['space'], json_dict['node'])
+        return cls(json_dict['$id'], json_dict['properties'], loads(json_dict['space']), loads(json_dict['node']))
 
     @classmethod
-    def from_json(cls, json_dict: Dict) -> 'Cell':
-        json_dict['cell_id'] = json_dict.pop('$id')
-        json_dict['space'] = loads(json_dict['space'])
-        json_dict['node'] = loads(json_dict['node'])
-        return cls(**json_dict)
+    def from_json_list(cls, json_dicts: List[Dict], lazy: bool = False) -> List['Cell']:
+        if lazy:
+            return [cls.from_json(json_dict, lazy=True) for json_dict in json_dicts]
+        with phase('wkt'):
+            spaces = from_wkt(np.array([json_dict['space'] for json_dict in json_dicts], dtype=object)).tolist()
+            nodes = from_wkt(np.array([json_dict['node'] for json_dict in json_dicts], dtype=object)).tolist()
+        with phase('construct'):
+            return [cls(json_dict['$id'], json_dict['properties'], space, node)
+                    for json_dict, space, node in zip(json_dicts, spaces, nodes)]
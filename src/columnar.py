@@ -0,0 +1,229 @@
+"""
+File Name: columnar.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import sys
+import numpy as np
+import shapely
+from typing import List, Dict, Iterator, Optional
+from shapely.geometry.base import BaseGeometry
+from cell import Cell
+from connection import Connection
+from layer import Layer
+from rlines import Rlines
+from indoorspace import IndoorSpace
+
+
+def _interned(strings: List[str]) -> np.ndarray:
+    ids = np.empty(len(strings), dtype=object)
+    ids[:] = [sys.intern(string) for string in strings]
+    return ids
+
+
+def _geometries(geometries: List[BaseGeometry]) -> np.ndarray:
+    array = np.empty(len(geometries), dtype=object)
+    array[:] = geometries
+    return array
+
+
+class CellView:
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'ColumnarSpace', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def id(self) -> str:
+        return self._store.cell_ids[self._index]
+
+    @property
+    def properties(self) -> Dict:
+        return self._store.cell_properties[self._index]
+
+    @property
+    def space(self) -> BaseGeometry:
+        return self._store.cell_spaces[self._index]
+
+    @property
+    def node(self) -> BaseGeometry:
+        return self._store.cell_nodes[self._index]
+
+    def to_cell(self) -> Cell:
+        return Cell(self.id, self.properties, self.space, self.node)
+
+    def to_json(self) -> Dict:
+        return self.to_cell().to_json()
+
+
+class ConnectionView:
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'ColumnarSpace', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def id(self) -> str:
+        return self._store.connection_ids[self._index]
+
+    @property
+    def properties(self) -> Dict:
+        return self._store.connection_properties[self._index]
+
+    @property
+    def source(self) -> str:
+        return self._store.cell_ids[self._store.sources[self._index]]
+
+    @property
+    def target(self) -> str:
+        return self._store.cell_ids[self._store.targets[self._index]]
+
+    @property
+    def bound(self) -> BaseGeometry:
+        return self._store.bounds[self._index]
+
+    @property
+    def edge(self) -> BaseGeometry:
+        return self._store.edges[self._index]
+
+    def to_connection(self) -> Connection:
+        return Connection(self.id, self.properties, self.source, self.target, self.bound, self.edge)
+
+    def to_json(self) -> Dict:
+        return self.to_connection().to_json()
+
+
+class ColumnarSpace:
+
+    def __init__(self, properties: Dict, cell_ids: np.ndarray, cell_properties: List[Dict],
+                 cell_spaces: np.ndarray, cell_nodes: np.ndarray, connection_ids: np.ndarray,
+                 connection_properties: List[Dict], sources: np.ndarray, targets: np.ndarray,
+                 bounds: np.ndarray, edges: np.ndarray, layers: List[Layer], rlineses: List[Rlines]):
+        self.properties: Dict = properties
+        self.cell_ids: np.ndarray = cell_ids
+        self.cell_properties: List[Dict] = cell_properties
+        self.cell_spaces: np.ndarray = cell_spaces
+        self.cell_nodes: np.ndarray = cell_nodes
+        self.connection_ids: np.ndarray = connection_ids
+        self.connection_properties: List[Dict] = connection_properties
+        self.sources: np.ndarray = sources
+        self.targets: np.ndarray = targets
+        self.bounds: np.ndarray = bounds
+        self.edges: np.ndarray = edges
+        self.layers: List[Layer] = layers
+        self.rlineses: List[Rlines] = rlineses
+        self._cell_index: Optional[Dict[str, int]] = None
+        self._connection_index: Optional[Dict[str, int]] = None
+
+    @property
+    def cell_count(self) -> int:
+        return len(self.cell_ids)
+
+    @property
+    def connection_count(self) -> int:
+        return len(self.connection_ids)
+
+    def cell_index(self, cell_id: str) -> int:
+        if self._cell_index is None:
+            self._cell_index = {cell_id: i for i, cell_id in enumerate(self.cell_ids.tolist())}
+        return self._cell_index[cell_id]
+
+    def connection_index(self, connection_id: str) -> int:
+        if self._connection_index is None:
+            self._connection_index = {connection_id: i for i, connection_id in enumerate(self.connection_ids.tolist())}
+        return self._connection_index[connection_id]
+
+    def cell(self, index: int) -> CellView:
+        return CellView(self, index)
+
+    def connection(self, index: int) -> ConnectionView:
+        return ConnectionView(self, index)
+
+    def get_cell_from_id(self, cell_id: str) -> Optional[CellView]:
+        try:
+            return CellView(self, self.cell_index(cell_id))
+        except KeyError:
+            return None
+
+    def get_connection_from_id(self, connection_id: str) -> Optional[ConnectionView]:
+        try:
+            return ConnectionView(self, self.connection_index(connection_id))
+        except KeyError:
+            return None
+
+    def iter_cells(self) -> Iterator[CellView]:
+        return (CellView(self, i) for i in range(self.cell_count))
+
+    def iter_connections(self) -> Iterator[ConnectionView]:
+        return (ConnectionView(self, i) for i in range(self.connection_count))
+
+    def out_degrees(self) -> np.ndarray:
+        return np.bincount(self.sources, minlength=self.cell_count)
+
+    def in_degrees(self) -> np.ndarray:
+        return np.bincount(self.targets, minlength=self.cell_count)
+
+    def incident_connections(self, cell_id: str) -> np.ndarray:
+        index = self.cell_index(cell_id)
+        return np.flatnonzero((self.sources == index) | (self.targets == index))
+
+    def cells_containing(self, x: float, y: float) -> np.ndarray:
+        return np.flatnonzero(shapely.intersects_xy(self.cell_spaces, x, y))
+
+    @classmethod
+    def from_indoorspace(cls, indoorspace: IndoorSpace) -> 'ColumnarSpace':
+        cells = indoorspace.cells
+        connections = indoorspace.connections
+        cell_index = {cell.id: i for i, cell in enumerate(cells)}
+        return cls(
+            indoorspace.properties,
+            _interned([cell.id for cell in cells]),
+            [cell.properties for cell in cells],
+            _geometries([cell.space for cell in cells]),
+            _geometries([cell.node for cell in cells]),
+            _interned([connection.id for connection in connections]),
+            [connection.properties for connection in connections],
+            np.fromiter((cell_index[c.source] for c in connections), dtype=np.int32, count=len(connections)),
+            np.fromiter((cell_index[c.target] for c in connections), dtype=np.int32, count=len(connections)),
+            _geometries([connection.bound for connection in connections]),
+            _geometries([connection.edge for connection in connections]),
+            list(indoorspace.layers),
+            list(indoorspace.rlineses)
+        )
+
+    def to_indoorspace(self) -> IndoorSpace:
+        indoorSpace = IndoorSpace()
+        indoorSpace.set_properties(self.properties)
+        for view in self.iter_cells():
+            indoorSpace.add_cell(view.to_cell())
+        for view in self.iter_connections():
+            indoorSpace.add_connection(view.to_connection())
+        for layer in self.layers:
+            indoorSpace.set_layers(layer)
+        for rlines in self.rlineses:
+            indoorSpace.set_rlineses(rlines)
+        return indoorSpace
+
+    def to_json(self) -> Dict:
+        return {
+            'properties': self.properties,
+            'cells': [view.to_json() for view in self.iter_cells()],
+            'connections': [view.to_json() for view in self.iter_connections()],
+            'layers': [layer.to_json() for layer in self.layers],
+            'rlineses': [rlines.to_json() for rlines in self.rlineses]
+        }
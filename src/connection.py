@@ -8,10 +8,14 @@ Create Date: 2024/3/14
 """
 
 import json
+import numpy as np
 from functools import wraps
-from typing import Dict
+from typing import Dict, List, Union
+from shapely import from_wkt
 from shapely.wkt import loads
 from shapely.geometry.base import BaseGeometry
+from cell import raw_geometry, geometry_wkt
+from instrumentation import phase
 
 
 def type_check(func):
@@ -36,6 +40,8 @@ def type_check(func):
 
 class Connection:
 
+    __slots__ = ('__id', '__properties', '__fr', '__to', '__bound', '__edge')
+
     @type_check
     def __init__(self, connections_id: str, properties: Dict, fr: str, to: str,
                  bound: BaseGeometry, edge: BaseGeometry):
@@ -64,28 +70,69 @@ class Connection:
 
     @property
     def bound(self) -> BaseGeometry:
+        if not isinstance(self.__bound, BaseGeometry):
+            self.__bound = raw_geometry(self.__bound)
         return self.__bound
 
     @property
     def edge(self) -> BaseGeometry:
+        if not isinstance(self.__edge, BaseGeometry):
+            self.__edge = raw_geometry(self.__edge)
         return self.__edge
 
     def to_json(self) -> Dict:
-        result = {}
-        for key, value in self.__dict__.items():
-            json_key = key.split('__')[-1]
-            if isinstance(value, BaseGeometry):
-                result[json_key] = value.wkt
-            elif json_key == 'id':
-                json_key = '$id'
-                result[json_key] = value
-            else:
-                result[json_key] = value
-        return result
+        return {
+            '$id': self.__id,
+            'properties': self.__properties,
+            'fr': self.__fr,
+            'to': self.__to,
+            'bound': geometry_wkt(self.__bound),
+            'edge': geometry_wkt(self.__edge)
+        }
+
+    @classmethod
+    def from_raw(cls, connection_id: str, properties: Dict, fr: str, to: str,
+                 bound: Union[str, bytes], edge: Union[str, bytes]) -> 'Connection':
+        if not isinstance(connection_id, str):
+            raise TypeError("connection_id must be a string")
+        if not isinstance(properties, dict):
+            raise TypeError("properties must be a dictionary")
+        if not isinstance(fr, str):
+            raise TypeError("source must be a string")
+        if not isinstance(to, str):
+            raise TypeError("target must be a string")
+        if not isinstance(bound, (str, bytes)):
+            raise TypeError("bound must be a WKT string or WKB bytes")
+        if not isinstance(edge, (str, bytes)):
+            raise TypeError("edge must be a WKT string or WKB bytes")
+        return cls.unchecked(connection_id, properties, fr, to, bound, edge)
+
+    @classmethod
+    def unchecked(cls, connection_id: str, properties: Dict, fr: str, to: str, bound, edge) -> 'Connection':
+        connection = cls.__new__(cls)
+        connection.__id = connection_id
+        connection.__properties = properties
+        connection.__fr = fr
+        connection.__to = to
+        connection.__bound = bound
+        connection.__edge = edge
+        return connection
+
+    @classmethod
+    def from_json(cls, json_dict: Dict, lazy: bool = False) -> 'Connection':
+        if lazy:
+            return cls.from_raw(json_dict['$id'], json_dict['properties'], json_dict['fr'], json_dict['to'],
+                                json_dict['bound'], json_dict['edge'])
+        return cls(json_dict['$id'], json_dict['properties'], json_dict['fr'], json_dict['to'],
+                   loads(json_dict['bound']), loads(json_dict['edge']))
 
     @classmethod
-    def from_json(cls, json_dict: Dict) -> 'Connection':
-        json_dict['connection_id'] = json_dict.pop('$id')
-        json_dict['bound'] = loads(json_dict['bound'])
-        json_dict['edge'] = loads(json_dict['edge'])
-        return cls(**json_dict)
+    def from_json_list(cls, json_dicts: List[Dict], lazy: bool = False) -> List['Connection']:
+        if lazy:
+            return [cls.from_json(json_dict, lazy=True) for json_dict in json_dicts]
+        with phase('wkt'):
+            bounds = from_wkt(np.array([json_dict['bound'] for json_dict in json_dicts], dtype=object)).tolist()
+            edges = from_wkt(np.array([json_dict['edge'] for json_dict in json_dicts], dtype=object)).tolist()
+        with phase('construct'):
+            return [cls(json_dict['$id'], json_dict['properties'], json_dict['fr'], json_dict['to'], bound, edge)
+                    for json_dict, bound, edge in zip(json_dicts, bounds, edges)]
@@ -8,12 +8,29 @@ Create Date: 2024/3/14
 """
 
 import json
+import threading
 import numpy as np
+import shapely
 from cell import Cell
 from connection import Connection
 from layer import Layer
 from rlines import Rlines
-from typing import List, Dict
+from spatial import SpatialIndex, Point
+from routing import Router
+from cancellation import LoadCancelled
+from turns import TurnTable
+from instrumentation import phase
+from typing import List, Dict, Any, Callable, Optional
+
+try:
+    from scipy import sparse as sp
+except ImportError:
+    sp = None
+
+
+def _xy(points: np.ndarray) -> np.ndarray:
+    # empty geometries keep their row as NaN instead of being dropped
+    return np.column_stack((shapely.get_x(points), shapely.get_y(points))).astype(float).reshape(-1, 2)
 
 
 class IndoorSpace:
@@ -24,7 +41,20 @@ class IndoorSpace:
         self._connections: List[Connection] = []
         self._layers: List[Layer] = []
         self._rlineses: List[Rlines] = []
+        self._stubs: List[Connection] = []
         self._hypergraph: Dict = {}
+        self._cell_index: Dict[str, Cell] = {}
+        self._connection_index: Dict[str, Connection] = {}
+        self._closures: Dict[str, List] = {}
+        self._version: int = 0
+        self._hypergraph_version: int = -1
+        self._hyperedges: Dict[str, Dict] = {}
+        self._hypernodes: Dict[str, Dict] = {}
+        self._cache: Dict[str, tuple] = {}
+        self._references: Dict[str, int] = {}
+        # removals only drop ids from the ordered registries, the lists are rebuilt on the next read
+        self._stale: bool = False
+        self._hypergraph_stale: bool = False
 
     @property
     def properties(self) -> Dict:
@@ -32,10 +62,12 @@ class IndoorSpace:
 
     @property
     def cells(self) -> List[Cell]:
+        self._compact()
         return self._cells
 
     @property
     def connections(self) -> List[Connection]:
+        self._compact()
         return self._connections
 
     @property
@@ -46,138 +78,404 @@ class IndoorSpace:
     def rlineses(self) -> List[Rlines]:
         return self._rlineses
 
+    @property
+    def stubs(self) -> List[Connection]:
+        return self._stubs
+
     @property
     def hypergraph(self) -> Dict:
+        self._compact_hypergraph()
         return self._hypergraph
 
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _compact(self):
+        if self._stale:
+            self._cells = list(self._cell_index.values())
+            self._connections = list(self._connection_index.values())
+            self._stale = False
+
+    def _compact_hypergraph(self):
+        if self._hypergraph_stale:
+            self._hypergraph['hyperEdges'] = list(self._hyperedges.values())
+            self._hypergraph['hyperNodes'] = list(self._hypernodes.values())
+            self._hypergraph_stale = False
+
+    def _referenced(self, connection: Connection, change: int):
+        for cell_id in (connection.source, connection.target):
+            self._references[cell_id] = self._references.get(cell_id, 0) + change
+
+    def _modified(self, hypergraph_update=None):
+        live = self._hypergraph_version == self._version
+        self._version += 1
+        if live:
+            if hypergraph_update is not None:
+                hypergraph_update()
+            self._hypergraph_version = self._version
+
+    def _cached(self, name: str, factory: Callable[[], Any]) -> Any:
+        entry = self._cache.get(name)
+        if entry is None or entry[0] != self._version:
+            entry = (self._version, factory())
+            self._cache[name] = entry
+        return entry[1]
+
     def set_properties(self, properties: Dict):
         self._properties = properties
+        self._modified()
 
     def add_cell(self, cell: Cell):
-        if cell.id not in [c.id for c in self._cells]:
+        if cell.id not in self._cell_index:
             self._cells.append(cell)
+            self._cell_index[cell.id] = cell
+            self._modified(lambda: self._hyperedge_added(cell))
         else:
             raise ValueError('Cell id already exists')
 
     def add_connection(self, connection: Connection):
-        if connection.id not in [c.id for c in self._connections]:
-            if connection.source in [
-                    c.id for c in self._cells
-            ] and connection.target in [c.id for c in self._cells]:
+        if connection.id not in self._connection_index:
+            source_exists = connection.source in self._cell_index
+            target_exists = connection.target in self._cell_index
+            if source_exists and target_exists:
                 self._connections.append(connection)
-            elif connection.source not in [
-                    c.id for c in self._cells
-            ] and connection.target in [c.id for c in self._cells]:
+                self._connection_index[connection.id] = connection
+                self._referenced(connection, 1)
+                self._modified(lambda: self._hypernode_added(connection))
+            elif not source_exists and target_exists:
                 raise ValueError('Source cell does not exist')
-            elif connection.source in [
-                    c.id for c in self._cells
-            ] and connection.target not in [c.id for c in self._cells]:
+            elif source_exists and not target_exists:
                 raise ValueError('Target cell does not exist')
             else:
                 raise ValueError('Source and target cell do not exist')
         else:
             raise ValueError('Connection id already exists')
 
+    def add_stub(self, connection: Connection):
+        if (connection.source in self._cell_index) == (connection.target in self._cell_index):
+            raise ValueError('Stub must have exactly one end cell in the space')
+        self._stubs.append(connection)
+        self._referenced(connection, 1)
+        self._modified()
+
+    def remove_cell(self, cell_id: str) -> Cell:
+        cell = self._cell_index.get(cell_id)
+        if cell is None:
+            raise ValueError('Cell id does not exist')
+        if self._references.get(cell_id):
+            connection = next(connection for connection in self.connections + self._stubs
+                              if cell_id in (connection.source, connection.target))
+            raise ValueError('Cell is referenced by connection ' + connection.id)
+        del self._cell_index[cell_id]
+        self._stale = True
+        self._modified(lambda: self._hyperedge_removed(cell))
+        return cell
+
+    def remove_connection(self, connection_id: str) -> Connection:
+        connection = self._connection_index.get(connection_id)
+        if connection is None:
+            raise ValueError('Connection id does not exist')
+        del self._connection_index[connection_id]
+        self._referenced(connection, -1)
+        self._stale = True
+        self._modified(lambda: self._hypernode_removed(connection))
+        return connection
+
     def set_layers(self, layers: Layer):
         self._layers.append(layers)
+        self._modified()
 
     def set_rlineses(self, rlineses: Rlines):
         self._rlineses.append(rlineses)
+        self._closures.setdefault(rlineses.cell, rlineses.closure)
+        self._modified(lambda: self._closure_changed(rlineses.cell))
+
+    def remove_rlines(self, rlines_id: str) -> Rlines:
+        for rlines in self._rlineses:
+            if rlines.id == rlines_id:
+                break
+        else:
+            raise ValueError('Rlines id does not exist')
+        self._rlineses.remove(rlines)
+        self._closures.pop(rlines.cell, None)
+        for other in self._rlineses:
+            if other.cell == rlines.cell:
+                self._closures[rlines.cell] = other.closure
+                break
+        self._modified(lambda: self._closure_changed(rlines.cell))
+        return rlines
+
+    def _connection_cell_indices(self):
+        cell_index = {cell.id: i for i, cell in enumerate(self.cells)}
+        count = len(self.connections)
+        source_indices = np.fromiter((cell_index[c.source] for c in self.connections), dtype=np.int64, count=count)
+        target_indices = np.fromiter((cell_index[c.target] for c in self.connections), dtype=np.int64, count=count)
+        return source_indices, target_indices
+
+    def get_incident_matrix(self, sparse: bool = True):
+        with phase('get_incident_matrix') as metrics:
+            shape = (len(self.cells), len(self.connections))
+            metrics.count('cells', shape[0])
+            metrics.count('connections', shape[1])
+            with phase('cell_indices'):
+                source_indices, target_indices = self._connection_cell_indices()
+            columns = np.arange(shape[1], dtype=np.int64)
+
+            if not sparse:
+                with phase('dense'):
+                    incident_matrix = np.zeros(shape, dtype=int)
+                    incident_matrix[source_indices, columns] = 1
+                    incident_matrix[target_indices, columns] = -1
+                return incident_matrix
+
+            with phase('sparse'):
+                # a self-loop keeps only its target entry, as in the dense matrix
+                keep = source_indices != target_indices
+                rows = np.concatenate((source_indices[keep], target_indices))
+                cols = np.concatenate((columns[keep], columns))
+                data = np.concatenate((np.ones(np.count_nonzero(keep), dtype=np.int8),
+                                       -np.ones(shape[1], dtype=np.int8)))
+                if sp is None:
+                    return rows, cols, data
+                return sp.csc_matrix((data, (rows, cols)), shape=shape)
 
-    def get_incident_matrix(self):
-        cells = self.cells
-        connections = self.connections
-        incident_matrix = np.zeros((len(cells), len(connections)), dtype=int)
-        for j, connection in enumerate(connections):
-            source = self.get_cell_from_id(connection.source)
-            target = self.get_cell_from_id(connection.target)
-            source_index = cells.index(source)
-            target_index = cells.index(target)
-            incident_matrix[source_index, j] = 1
-            incident_matrix[target_index, j] = -1
-        return incident_matrix
-
-    def get_hypergraph_incidence_matrix(self):
-        return self.get_incident_matrix().T
+    def get_hypergraph_incidence_matrix(self, sparse: bool = True):
+        incident_matrix = self.get_incident_matrix(sparse)
+        if isinstance(incident_matrix, tuple):
+            rows, cols, data = incident_matrix
+            return cols, rows, data
+        return incident_matrix.T
+
+    def _hyperedge(self, cell: Cell, inner_nodeset: Dict) -> Dict:
+        hyperEdge = {
+            'id': cell.id,
+            'properties': cell.properties,
+            'space': cell.space.wkt,
+            'node': cell.node.wkt,
+            'inner_nodeset': inner_nodeset
+        }
+        if cell.id in self._closures:
+            hyperEdge['closure'] = self._closures[cell.id]
+        return hyperEdge
+
+    def _hyperedge_added(self, cell: Cell):
+        hyperEdge = self._hyperedge(cell, {'ins': [], 'outs': []})
+        self._hyperedges[cell.id] = hyperEdge
+        if not self._hypergraph_stale:
+            self._hypergraph['hyperEdges'].append(hyperEdge)
+
+    def _hyperedge_removed(self, cell: Cell):
+        del self._hyperedges[cell.id]
+        self._hypergraph_stale = True
+
+    def _hypernode_added(self, connection: Connection):
+        hyperNode = connection.to_json()
+        self._hypernodes[connection.id] = hyperNode
+        if not self._hypergraph_stale:
+            self._hypergraph['hyperNodes'].append(hyperNode)
+        self._hyperedges[connection.target]['inner_nodeset']['ins'].append(connection.id)
+        if connection.source != connection.target:
+            self._hyperedges[connection.source]['inner_nodeset']['outs'].append(connection.id)
+
+    def _hypernode_removed(self, connection: Connection):
+        del self._hypernodes[connection.id]
+        self._hypergraph_stale = True
+        self._hyperedges[connection.target]['inner_nodeset']['ins'].remove(connection.id)
+        if connection.source != connection.target:
+            self._hyperedges[connection.source]['inner_nodeset']['outs'].remove(connection.id)
+
+    def _closure_changed(self, cell_id: str):
+        hyperEdge = self._hyperedges.get(cell_id)
+        if hyperEdge is None:
+            return
+        if cell_id in self._closures:
+            hyperEdge['closure'] = self._closures[cell_id]
+        else:
+            hyperEdge.pop('closure', None)
 
     def get_hypergraph(self):
-        cells = self.cells
-        connections = self.connections
-        rlineses = self.rlineses
-        hypergraph = self._hypergraph
-        hypergraph['hyperNodes'] = []
-        hypergraph['hyperEdges'] = []
-        incident_matrix = self.get_incident_matrix()
-        incident_matrix_transpose = incident_matrix.T
-
-        for hyperNode in connections:
-            hypergraph['hyperNodes'].append(hyperNode.to_json())
-
-        for j in range(incident_matrix_transpose.shape[1]):
-            hyperEdge = {}
-            inner_edge_id = {'ins': [], 'outs': []}
-            for i in range(incident_matrix_transpose.shape[0]):
-                if incident_matrix_transpose[i, j] != 0:
-                    if incident_matrix_transpose[i, j] == -1:
-                        inner_edge_ins_id = connections[i].id
-                        inner_edge_id['ins'].append(inner_edge_ins_id)
-                    elif incident_matrix_transpose[i, j] == 1:
-                        inner_edge_outs_id = connections[i].id
-                        inner_edge_id['outs'].append(inner_edge_outs_id)
-                    else:
-                        raise ValueError('Incident matrix error')
-            hyperEdge['id'] = cells[j].id
-            hyperEdge['properties'] = cells[j].properties
-            hyperEdge['space'] = cells[j].space.wkt
-            hyperEdge['node'] = cells[j].node.wkt
-            hyperEdge['inner_nodeset'] = inner_edge_id
+        if self._hypergraph_version == self._version:
+            self._compact_hypergraph()
+            return self._hypergraph
+
+        with phase('get_hypergraph') as metrics:
+            hypergraph = self._hypergraph
+            with phase('hyperNodes'):
+                self._hypernodes = {hyperNode.id: hyperNode.to_json() for hyperNode in self.connections}
+                hypergraph['hyperNodes'] = list(self._hypernodes.values())
 
-            for rlines in rlineses:
-                if rlines.cell == cells[j].id:
-                    hyperEdge['closure'] = rlines.closure
-                    break
+            with phase('inner_nodesets'):
+                inner_nodesets = {cell.id: {'ins': [], 'outs': []} for cell in self.cells}
+                for connection in self.connections:
+                    inner_nodesets[connection.target]['ins'].append(connection.id)
+                    if connection.source != connection.target:
+                        inner_nodesets[connection.source]['outs'].append(connection.id)
 
-            hypergraph['hyperEdges'].append(hyperEdge)
+            with phase('hyperEdges'):
+                self._hyperedges = {cell.id: self._hyperedge(cell, inner_nodesets[cell.id]) for cell in self.cells}
+                hypergraph['hyperEdges'] = list(self._hyperedges.values())
 
-        self.set_hypergraph(hypergraph)
+            self.set_hypergraph(hypergraph)
+            self._hypergraph_stale = False
+            self._hypergraph_version = self._version
+            metrics.count('hyperNodes', len(self._hypernodes))
+            metrics.count('hyperEdges', len(self._hyperedges))
 
         return hypergraph
 
     def set_hypergraph(self, hypergraph):
         self._hypergraph = hypergraph
+        self._hypergraph_version = -1
+
+    def subspace(self, layer_ids: List[str]) -> 'IndoorSpace':
+        layers = {layer.id: layer for layer in self._layers}
+        missing = [layer_id for layer_id in layer_ids if layer_id not in layers]
+        if missing:
+            raise ValueError('Layer id does not exist: ' + ', '.join(map(str, missing)))
+        selected = {cell_id for layer_id in layer_ids for cell_id in layers[layer_id].cells}
+
+        instance = IndoorSpace()
+        instance._properties = self._properties
+        instance._cells = [cell for cell in self.cells if cell.id in selected]
+        instance._layers = [layer for layer in self._layers if layer.id in layer_ids]
+        for connection in self.connections + self._stubs:
+            inside = (connection.source in selected) + (connection.target in selected)
+            if inside == 2:
+                instance._connections.append(connection)
+            elif inside == 1:
+                # connections leaving the selected layers are kept as stubs
+                instance._stubs.append(connection)
+        # stubs are not written out, so the kept rlines must not refer to them
+        stub_ids = {stub.id for stub in instance._stubs}
+        instance._rlineses = [rlines.without(stub_ids) for rlines in self._rlineses if rlines.cell in selected]
+        instance._reindex()
+        return instance
 
     def get_cell_from_id(self, cell_id):
-        for cell in self.cells:
-            if cell.id == cell_id:
-                return cell
-        return None
+        return self._cell_index.get(cell_id)
 
     def get_connection_from_id(self, connection_id):
-        for connection in self.connections:
-            if connection.id == connection_id:
-                return connection
-        return None
+        return self._connection_index.get(connection_id)
+
+    def get_cell_index(self) -> SpatialIndex:
+        return self._cached('cell_index', lambda: SpatialIndex(self._geometries('cells', 'space')))
+
+    def get_connection_index(self) -> SpatialIndex:
+        return self._cached('connection_index', lambda: SpatialIndex(self._geometries('connections', 'bound')))
+
+    def _geometries(self, collection: str, attribute: str) -> np.ndarray:
+        def factory():
+            items = getattr(self, collection)
+            geometries = np.empty(len(items), dtype=object)
+            geometries[:] = [getattr(item, attribute) for item in items]
+            geometries.setflags(write=False)
+            return geometries
+        return self._cached(f'{collection}.{attribute}', factory)
+
+    def _analytic(self, name: str, factory: Callable[[], np.ndarray]) -> np.ndarray:
+        def frozen():
+            # cached arrays are shared between callers, so they are handed out read-only
+            values = factory()
+            values.setflags(write=False)
+            return values
+        return self._cached(name, frozen)
+
+    def cell_areas(self) -> np.ndarray:
+        return self._analytic('cell_areas', lambda: shapely.area(self._geometries('cells', 'space')).astype(float))
+
+    def cell_centroids(self) -> np.ndarray:
+        return self._analytic('cell_centroids', lambda: _xy(shapely.centroid(self._geometries('cells', 'space'))))
+
+    def door_widths(self) -> np.ndarray:
+        return self._analytic('door_widths',
+                              lambda: shapely.length(self._geometries('connections', 'bound')).astype(float))
+
+    def bound_centroids(self) -> np.ndarray:
+        return self._analytic('bound_centroids',
+                              lambda: _xy(shapely.centroid(self._geometries('connections', 'bound'))))
+
+    def edge_lengths(self) -> np.ndarray:
+        return self._analytic('edge_lengths',
+                              lambda: shapely.length(self._geometries('connections', 'edge')).astype(float))
+
+    def locate(self, point: Point) -> List[Cell]:
+        return [self.cells[i] for i in self.get_cell_index().query_point(point)]
+
+    def locate_points(self, points: np.ndarray) -> np.ndarray:
+        return self.get_cell_index().query_points(points)
+
+    def nearest_cells(self, point: Point, k: int = 1) -> List[Cell]:
+        return [self.cells[i] for i in self.get_cell_index().nearest(point, k)]
+
+    def cells_in_window(self, minx: float, miny: float, maxx: float, maxy: float) -> List[Cell]:
+        return [self.cells[i] for i in self.get_cell_index().query_window(minx, miny, maxx, maxy)]
+
+    def nearest_connections(self, point: Point, k: int = 1) -> List[Connection]:
+        return [self.connections[i] for i in self.get_connection_index().nearest(point, k)]
+
+    def connections_in_window(self, minx: float, miny: float, maxx: float, maxy: float) -> List[Connection]:
+        return [self.connections[i] for i in self.get_connection_index().query_window(minx, miny, maxx, maxy)]
+
+    def get_router(self) -> Router:
+        return self._cached('router', lambda: Router(self))
+
+    def get_turn_table(self) -> TurnTable:
+        return self._cached('turn_table', lambda: TurnTable.build(self))
+
+    def shortest_path(self, source_id: str, target_id: str):
+        return self.get_router().shortest_path(source_id, target_id)
 
     def to_json(self) -> Dict:
-        result = {}
-        for key, value in self.__dict__.items():
-            if key == '_hypergraph':
-                continue
-            elif key == '_properties':
-                result[key.strip('_')] = value
-            else:
-                result[key.strip('_')] = [item.to_json() for item in value]
-        return result
+        with phase('to_json') as metrics:
+            json_data = {'properties': self._properties}
+            for key in ('cells', 'connections', 'layers', 'rlineses'):
+                items = getattr(self, key)
+                with phase(key):
+                    json_data[key] = [item.to_json() for item in items]
+                metrics.count(key, len(items))
+            return json_data
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'IndoorSpace':
-        json_data = json.loads(json_str)
-        instance = cls()
-        for key, value in json_data.items():
-            if key == 'properties':
-                setattr(instance, f"_{key}", value)
-            elif key == 'rlineses':
-                setattr(instance, f"_{key}", [eval(key.capitalize()[:-2]).from_json(item) for item in value])
-            else:
-                setattr(instance, f"_{key}", [eval(key.capitalize()[:-1]).from_json(item) for item in value])
-        return instance
+    def from_json(cls, json_str: str, lazy: bool = False, progress: Optional[Callable[[int, int], None]] = None,
+                  cancel: Optional[threading.Event] = None) -> 'IndoorSpace':
+        with phase('from_json') as metrics:
+            with phase('json.loads'):
+                json_data = json.loads(json_str)
+            instance = cls()
+            # progress counts steps: parsing, each top-level key and the final reindex
+            steps = len(json_data) + 2
+            for step, (key, value) in enumerate(json_data.items(), 1):
+                if cancel is not None and cancel.is_set():
+                    raise LoadCancelled('Loading was cancelled')
+                if progress is not None:
+                    progress(step, steps)
+                with phase(key):
+                    if key == 'properties':
+                        setattr(instance, f"_{key}", value)
+                    elif key in ('cells', 'connections'):
+                        setattr(instance, f"_{key}", eval(key.capitalize()[:-1]).from_json_list(value, lazy))
+                    elif key == 'rlineses':
+                        setattr(instance, f"_{key}", [eval(key.capitalize()[:-2]).from_json(item) for item in value])
+                    else:
+                        setattr(instance, f"_{key}", [eval(key.capitalize()[:-1]).from_json(item) for item in value])
+                if key != 'properties':
+                    metrics.count(key, len(value))
+            if cancel is not None and cancel.is_set():
+                raise LoadCancelled('Loading was cancelled')
+            with phase('reindex'):
+                instance._reindex()
+            if progress is not None:
+                progress(steps, steps)
+            return instance
+
+    def _reindex(self):
+        self._cell_index = {cell.id: cell for cell in self._cells}
+        self._connection_index = {connection.id: connection for connection in self._connections}
+        self._references = {}
+        for connection in self._connections + self._stubs:
+            self._referenced(connection, 1)
+        self._closures = {}
+        for rlines in self._rlineses:
+            self._closures.setdefault(rlines.cell, rlines.closure)
+        self._version += 1
@@ -0,0 +1,225 @@
+"""
+File Name: instrumentation.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Callable, Iterator
+
+_recorder: Optional['Recorder'] = None
+
+
+class Phase:
+
+    __slots__ = ('name', 'seconds', 'counts', 'peak_bytes', 'children', '_start', '_base', '_carried', '_traced')
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.seconds: float = 0.0
+        self.counts: Dict[str, int] = {}
+        self.peak_bytes: Optional[int] = None
+        self.children: List['Phase'] = []
+        self._start: float = 0.0
+        self._base: int = 0
+        self._carried: int = 0
+        self._traced: bool = False
+
+    def count(self, name: str, value: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def to_json(self) -> Dict:
+        return {
+            'name': self.name,
+            'seconds': self.seconds,
+            'counts': self.counts,
+            'peak_bytes': self.peak_bytes,
+            'children': [child.to_json() for child in self.children]
+        }
+
+
+class _NullPhase:
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullPhase':
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _ActivePhase:
+
+    __slots__ = ('_recorder', '_phase')
+
+    def __init__(self, recorder: 'Recorder', name: str):
+        self._recorder = recorder
+        self._phase = Phase(name)
+
+    def __enter__(self) -> Phase:
+        self._recorder._enter(self._phase)
+        return self._phase
+
+    def __exit__(self, *exc_info):
+        self._recorder._exit(self._phase)
+        return False
+
+
+class Recorder:
+
+    def __init__(self, callback: Optional[Callable[[Phase], None]] = None, memory: bool = True):
+        self._callback = callback
+        self._memory = memory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._phases: List[Phase] = []
+        self._started_tracing = False
+
+    @property
+    def phases(self) -> List[Phase]:
+        return self._phases
+
+    def _stack(self) -> List[Phase]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _tracing(self) -> bool:
+        # peaks are only measured while this recorder owns tracemalloc, since reset_peak() would
+        # corrupt the readings of anyone else tracing
+        return self._started_tracing and tracemalloc.is_tracing()
+
+    def _enter(self, phase: Phase):
+        stack = self._stack()
+        if self._tracing():
+            # the traced peak is global, so the parent's peak so far is carried over before it is reset
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]._carried = max(stack[-1]._carried, peak)
+            tracemalloc.reset_peak()
+            phase._base = phase._carried = current
+            phase._traced = True
+        stack.append(phase)
+        phase._start = time.perf_counter()
+
+    def _exit(self, phase: Phase):
+        phase.seconds = time.perf_counter() - phase._start
+        stack = self._stack()
+        stack.pop()
+        if phase._traced and self._tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], phase._carried)
+            phase.peak_bytes = peak - phase._base
+            tracemalloc.reset_peak()
+            if stack:
+                stack[-1]._carried = max(stack[-1]._carried, peak)
+        if stack:
+            stack[-1].children.append(phase)
+        else:
+            with self._lock:
+                self._phases.append(phase)
+        if self._callback is not None:
+            self._callback(phase)
+
+    def phase(self, name: str) -> _ActivePhase:
+        return _ActivePhase(self, name)
+
+    def count(self, name: str, value: int = 1):
+        stack = self._stack()
+        if stack:
+            stack[-1].count(name, value)
+
+    def start(self):
+        if self._memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def walk(self) -> Iterator[Phase]:
+        pending = list(reversed(self._phases))
+        while pending:
+            phase = pending.pop()
+            yield phase
+            pending.extend(reversed(phase.children))
+
+    def summary(self) -> Dict[str, Dict]:
+        summary: Dict[str, Dict] = {}
+        for phase in self.walk():
+            entry = summary.setdefault(phase.name, {'calls': 0, 'seconds': 0.0, 'counts': {}, 'peak_bytes': None})
+            entry['calls'] += 1
+            entry['seconds'] += phase.seconds
+            for name, value in phase.counts.items():
+                entry['counts'][name] = entry['counts'].get(name, 0) + value
+            if phase.peak_bytes is not None:
+                entry['peak_bytes'] = max(entry['peak_bytes'] or 0, phase.peak_bytes)
+        return summary
+
+    def to_json(self) -> List[Dict]:
+        return [phase.to_json() for phase in self._phases]
+
+    def clear(self):
+        with self._lock:
+            self._phases = []
+
+
+def phase(name: str):
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_PHASE
+    return recorder.phase(name)
+
+
+def count(name: str, value: int = 1):
+    recorder = _recorder
+    if recorder is not None:
+        recorder.count(name, value)
+
+
+def enable(callback: Optional[Callable[[Phase], None]] = None, memory: bool = True) -> Recorder:
+    global _recorder
+    disable()
+    _recorder = Recorder(callback, memory)
+    _recorder.start()
+    return _recorder
+
+
+def disable() -> Optional[Recorder]:
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.stop()
+    return recorder
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+@contextmanager
+def recording(callback: Optional[Callable[[Phase], None]] = None, memory: bool = True) -> Iterator[Recorder]:
+    global _recorder
+    previous = _recorder
+    recorder = Recorder(callback, memory)
+    recorder.start()
+    _recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+        recorder.stop()
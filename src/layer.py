@@ -25,6 +25,8 @@ def type_check(func):
 
 class Layer:
 
+    __slots__ = ('__id', '__cells')
+
     @type_check
     def __init__(self, layer_id: str, cells: List[str]):
         self.__id: str = layer_id
@@ -39,15 +41,18 @@ class Layer:
         return self.__cells
 
     def to_json(self) -> Dict:
-        result = {}
-        for key, value in self.__dict__.items():
-            json_key = key.split('__')[-1]
-            if json_key == 'id':
-                json_key = '$id'
-            result[json_key] = value
-        return result
+        return {
+            '$id': self.__id,
+            'cells': self.__cells
+        }
+
+    @classmethod
+    def unchecked(cls, layer_id: str, cells: List[str]) -> 'Layer':
+        layer = cls.__new__(cls)
+        layer.__id = layer_id
+        layer.__cells = cells
+        return layer
 
     @classmethod
     def from_json(cls, json_dict: Dict) -> 'Layer':
-        json_dict['layer_id'] = json_dict.pop('$id')
-        return cls(**json_dict)
+        return cls(json_dict['$id'], json_dict['cells'])
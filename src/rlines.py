@@ -9,7 +9,7 @@ Create Date: 2024/3/14
 
 import json
 from functools import wraps
-from typing import List, Dict
+from typing import List, Dict, Set
 
 
 def type_check(func):
@@ -31,6 +31,8 @@ def type_check(func):
 
 class Rlines:
 
+    __slots__ = ('__id', '__cell', '__ins', '__outs', '__closure')
+
     @type_check
     def __init__(self, rlines_id: str, cell: str, ins: List[str], outs: List[str], closure: List[str]):
         self.__id: str = rlines_id
@@ -60,15 +62,33 @@ class Rlines:
         return self.__closure
 
     def to_json(self) -> Dict:
-        result = {}
-        for key, value in self.__dict__.items():
-            json_key = key.split('__')[-1]
-            if json_key == 'id':
-                json_key = '$id'
-            result[json_key] = value
-        return result
+        return {
+            '$id': self.__id,
+            'cell': self.__cell,
+            'ins': self.__ins,
+            'outs': self.__outs,
+            'closure': self.__closure
+        }
+
+    def without(self, connection_ids: Set[str]) -> 'Rlines':
+        if not connection_ids:
+            return self
+        return Rlines.unchecked(self.__id, self.__cell,
+                                [item for item in self.__ins if item not in connection_ids],
+                                [item for item in self.__outs if item not in connection_ids],
+                                [pair for pair in self.__closure
+                                 if not (isinstance(pair, list) and any(item in connection_ids for item in pair))])
+
+    @classmethod
+    def unchecked(cls, rlines_id: str, cell: str, ins: List[str], outs: List[str], closure: List[str]) -> 'Rlines':
+        rlines = cls.__new__(cls)
+        rlines.__id = rlines_id
+        rlines.__cell = cell
+        rlines.__ins = ins
+        rlines.__outs = outs
+        rlines.__closure = closure
+        return rlines
 
     @classmethod
     def from_json(cls, json_dict: Dict) -> 'Rlines':
-        json_dict['rlines_id'] = json_dict.pop('$id')
-        return cls(**json_dict)
+        return cls(json_dict['$id'], json_dict['cell'], json_dict['ins'], json_dict['outs'], json_dict['closure'])
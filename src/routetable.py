@@ -0,0 +1,179 @@
+"""
+File Name: routetable.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import os
+import json
+import math
+import heapq
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional
+
+CACHE_VERSION = 1
+PARALLEL_THRESHOLD = 2000
+
+_graph = None
+
+
+def _init_worker(graph):
+    global _graph
+    _graph = graph
+
+
+def _reverse_dijkstra(graph, targets: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    cell_count, indptr, incoming, sources, weights = graph
+    distances = np.full((len(targets), cell_count), np.inf)
+    next_hops = np.full((len(targets), cell_count), -1, dtype=np.int32)
+    for row, target in enumerate(targets):
+        best = {target: 0.0}
+        hops = {}
+        settled = set()
+        heap = [(0.0, target)]
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if cell in settled:
+                continue
+            settled.add(cell)
+            for connection in incoming[indptr[cell]:indptr[cell + 1]]:
+                source = sources[connection]
+                next_distance = distance + weights[connection]
+                if next_distance < best.get(source, math.inf):
+                    best[source] = next_distance
+                    hops[source] = connection
+                    heapq.heappush(heap, (next_distance, source))
+        cells = list(best)
+        distances[row, cells] = list(best.values())
+        if hops:
+            next_hops[row, list(hops)] = list(hops.values())
+    return distances, next_hops
+
+
+def _reverse_dijkstra_chunk(targets: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    return _reverse_dijkstra(_graph, targets)
+
+
+def model_hash(router) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps([CACHE_VERSION, router.cell_ids, router.connection_ids]).encode('utf-8'))
+    for array in (router.sources, router.targets, router.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class RouteTable:
+
+    def __init__(self, cell_ids: List[str], connection_ids: List[str], targets: np.ndarray,
+                 distances: np.ndarray, next_hops: np.ndarray):
+        self._cell_ids: List[str] = cell_ids
+        self._cell_index: Dict[str, int] = {cell_id: i for i, cell_id in enumerate(cell_ids)}
+        self._connection_ids: List[str] = connection_ids
+        self._targets: np.ndarray = targets
+        self._distances: np.ndarray = distances
+        self._next_hops: np.ndarray = next_hops
+
+    @property
+    def cell_ids(self) -> List[str]:
+        return self._cell_ids
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self._distances
+
+    @property
+    def next_hops(self) -> np.ndarray:
+        return self._next_hops
+
+    def _index(self, cell_id: str) -> int:
+        index = self._cell_index.get(cell_id)
+        if index is None:
+            raise ValueError('Cell id does not exist: ' + str(cell_id))
+        return index
+
+    def distance(self, source_id: str, target_id: str) -> float:
+        return float(self._distances[self._index(source_id), self._index(target_id)])
+
+    def path(self, source_id: str, target_id: str) -> Tuple[float, List[str], List[str]]:
+        source, target = self._index(source_id), self._index(target_id)
+        distance = float(self._distances[source, target])
+        if math.isinf(distance):
+            return distance, [], []
+        cells, connections = [source_id], []
+        while source != target:
+            connection = int(self._next_hops[source, target])
+            connections.append(self._connection_ids[connection])
+            source = int(self._targets[connection])
+            cells.append(self._cell_ids[source])
+        return distance, cells, connections
+
+    @classmethod
+    def build(cls, indoorspace, processes: Optional[int] = None, chunk_size: int = 256) -> 'RouteTable':
+        # a per-cell next-hop table cannot encode turn restrictions, so Rlines closures are ignored
+        router = indoorspace.get_router()
+        cell_count = len(router.cell_ids)
+        order = np.argsort(router.targets, kind='stable')
+        indptr = np.zeros(cell_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(router.targets, minlength=cell_count), out=indptr[1:])
+        graph = (cell_count, indptr.tolist(), order.tolist(), router.sources.tolist(), router.weights.tolist())
+
+        distances = np.full((cell_count, cell_count), np.inf)
+        next_hops = np.full((cell_count, cell_count), -1, dtype=np.int32)
+        chunks = [list(range(start, min(start + chunk_size, cell_count)))
+                  for start in range(0, cell_count, chunk_size)]
+
+        def store(chunk, result):
+            # row t of a reverse search holds every source's distance to target t
+            distances[:, chunk] = result[0].T
+            next_hops[:, chunk] = result[1].T
+
+        if processes == 1 or (processes is None and cell_count < PARALLEL_THRESHOLD):
+            for chunk in chunks:
+                store(chunk, _reverse_dijkstra(graph, chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(graph,)) as executor:
+                for chunk, result in zip(chunks, executor.map(_reverse_dijkstra_chunk, chunks)):
+                    store(chunk, result)
+        return cls(list(router.cell_ids), list(router.connection_ids), router.targets.copy(), distances, next_hops)
+
+    def save(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'distances.npy'), self._distances)
+        np.save(os.path.join(directory, 'next_hops.npy'), self._next_hops)
+        np.save(os.path.join(directory, 'targets.npy'), self._targets)
+        with open(os.path.join(directory, 'ids.json'), 'w', encoding='utf-8') as file:
+            json.dump({'cells': self._cell_ids, 'connections': self._connection_ids}, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str) -> 'RouteTable':
+        with open(os.path.join(directory, 'ids.json'), 'r', encoding='utf-8') as file:
+            ids = json.load(file)
+        return cls(ids['cells'], ids['connections'],
+                   np.load(os.path.join(directory, 'targets.npy'), mmap_mode='r'),
+                   np.load(os.path.join(directory, 'distances.npy'), mmap_mode='r'),
+                   np.load(os.path.join(directory, 'next_hops.npy'), mmap_mode='r'))
+
+    @classmethod
+    def load_or_build(cls, indoorspace, cache_dir: str, processes: Optional[int] = None) -> 'RouteTable':
+        directory = os.path.join(cache_dir, model_hash(indoorspace.get_router()))
+        if os.path.exists(os.path.join(directory, 'ids.json')):
+            return cls.load(directory)
+        os.makedirs(cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=cache_dir)
+        try:
+            cls.build(indoorspace, processes).save(staging)
+            os.replace(staging, directory)
+        except OSError:
+            # another process published the same model first
+            if not os.path.exists(os.path.join(directory, 'ids.json')):
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return cls.load(directory)
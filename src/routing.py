@@ -0,0 +1,170 @@
+"""
+File Name: routing.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import math
+import heapq
+import numpy as np
+import shapely
+from typing import List, Dict, Tuple, Iterable, Optional
+
+Path = Tuple[float, List[str], List[str]]
+
+
+class Router:
+
+    def __init__(self, indoorspace):
+        cells = indoorspace.cells
+        connections = indoorspace.connections
+        self._cell_ids: List[str] = [cell.id for cell in cells]
+        self._cell_index: Dict[str, int] = {cell_id: i for i, cell_id in enumerate(self._cell_ids)}
+        self._connection_ids: List[str] = [connection.id for connection in connections]
+        connection_index = {connection_id: i for i, connection_id in enumerate(self._connection_ids)}
+
+        sources = np.fromiter((self._cell_index[c.source] for c in connections), dtype=np.int64,
+                              count=len(connections))
+        targets = np.fromiter((self._cell_index[c.target] for c in connections), dtype=np.int64,
+                              count=len(connections))
+        weights = indoorspace.edge_lengths()
+
+        order = np.argsort(sources, kind='stable')
+        indptr = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(cells)), out=indptr[1:])
+        self.indptr: np.ndarray = indptr
+        self.indices: np.ndarray = order
+        self.sources: np.ndarray = sources
+        self.targets: np.ndarray = targets
+        self.weights: np.ndarray = np.asarray(weights, dtype=float)
+
+        nodes = np.empty(len(cells), dtype=object)
+        nodes[:] = [cell.node for cell in cells]
+        self._x: List[float] = shapely.get_x(nodes).tolist() if len(cells) else []
+        self._y: List[float] = shapely.get_y(nodes).tolist() if len(cells) else []
+
+        # edges need not run between cell nodes, so the heuristic is scaled down until no edge beats it
+        x, y = np.asarray(self._x, dtype=float), np.asarray(self._y, dtype=float)
+        spans = np.hypot(x[sources] - x[targets], y[sources] - y[targets])
+        ratios = self.weights[spans > 0] / spans[spans > 0]
+        self._scale: float = float(min(1.0, ratios.min())) if len(ratios) else 1.0
+
+        self._restrictions = set()
+        for rlines in indoorspace.rlineses:
+            for pair in rlines.closure:
+                if isinstance(pair, (list, tuple)) and len(pair) == 2 \
+                        and pair[0] in connection_index and pair[1] in connection_index:
+                    self._restrictions.add((connection_index[pair[0]], connection_index[pair[1]]))
+
+        # plain lists keep the inner search loop free of NumPy scalar overhead
+        self._indptr: List[int] = indptr.tolist()
+        self._out: List[int] = order.tolist()
+        self._targets: List[int] = targets.tolist()
+        self._weights: List[float] = self.weights.tolist()
+
+    @property
+    def cell_ids(self) -> List[str]:
+        return self._cell_ids
+
+    @property
+    def connection_ids(self) -> List[str]:
+        return self._connection_ids
+
+    @property
+    def restrictions(self) -> set:
+        return self._restrictions
+
+    def _index(self, cell_id: str) -> int:
+        index = self._cell_index.get(cell_id)
+        if index is None:
+            raise ValueError('Cell id does not exist: ' + str(cell_id))
+        return index
+
+    def _search(self, source: int, targets: Iterable[int], goal: Optional[int] = None) -> Tuple[Dict, Dict]:
+        indptr, out, conn_targets, weights = self._indptr, self._out, self._targets, self._weights
+        restrictions = self._restrictions
+        remaining = set(targets)
+        found: Dict[int, Tuple[float, int]] = {}
+        if source in remaining:
+            found[source] = (0.0, -1)
+            remaining.discard(source)
+
+        if goal is None:
+            def heuristic(cell):
+                return 0.0
+        else:
+            # the scaled straight-line distance never overestimates the remaining edge lengths
+            goal_x, goal_y, scale = self._x[goal], self._y[goal], self._scale
+
+            def heuristic(cell):
+                return scale * math.hypot(self._x[cell] - goal_x, self._y[cell] - goal_y)
+
+        best: Dict[int, float] = {}
+        heap = []
+        for connection in out[indptr[source]:indptr[source + 1]]:
+            distance = weights[connection]
+            if distance < best.get(connection, math.inf):
+                best[connection] = distance
+                heapq.heappush(heap, (distance + heuristic(conn_targets[connection]), distance, connection, -1))
+
+        parents: Dict[int, int] = {}
+        while heap and remaining:
+            _, distance, connection, parent = heapq.heappop(heap)
+            if connection in parents:
+                continue
+            parents[connection] = parent
+            cell = conn_targets[connection]
+            if cell in remaining:
+                found[cell] = (distance, connection)
+                remaining.discard(cell)
+            for next_connection in out[indptr[cell]:indptr[cell + 1]]:
+                if next_connection in parents or (connection, next_connection) in restrictions:
+                    continue
+                next_distance = distance + weights[next_connection]
+                if next_distance < best.get(next_connection, math.inf):
+                    best[next_connection] = next_distance
+                    heapq.heappush(heap, (next_distance + heuristic(conn_targets[next_connection]), next_distance,
+                                          next_connection, connection))
+        return found, parents
+
+    def _path(self, source: int, found: Tuple[float, int], parents: Dict[int, int]) -> Path:
+        distance, connection = found
+        connections = []
+        while connection != -1:
+            connections.append(connection)
+            connection = parents[connection]
+        connections.reverse()
+        cells = [self._cell_ids[source]] + [self._cell_ids[self._targets[c]] for c in connections]
+        return distance, cells, [self._connection_ids[c] for c in connections]
+
+    def shortest_path(self, source_id: str, target_id: str) -> Path:
+        source, target = self._index(source_id), self._index(target_id)
+        found, parents = self._search(source, [target], goal=target)
+        if target not in found:
+            return math.inf, [], []
+        return self._path(source, found[target], parents)
+
+    def shortest_paths(self, source_ids: List[str], target_ids: List[str]) -> Dict[Tuple[str, str], Path]:
+        targets = [self._index(target_id) for target_id in target_ids]
+        paths = {}
+        for source_id in source_ids:
+            source = self._index(source_id)
+            found, parents = self._search(source, targets)
+            for target_id, target in zip(target_ids, targets):
+                if target in found:
+                    paths[(source_id, target_id)] = self._path(source, found[target], parents)
+                else:
+                    paths[(source_id, target_id)] = (math.inf, [], [])
+        return paths
+
+    def distance_matrix(self, source_ids: List[str], target_ids: List[str]) -> np.ndarray:
+        targets = [self._index(target_id) for target_id in target_ids]
+        matrix = np.full((len(source_ids), len(target_ids)), np.inf)
+        for i, source_id in enumerate(source_ids):
+            found, _ = self._search(self._index(source_id), targets)
+            for j, target in enumerate(targets):
+                if target in found:
+                    matrix[i, j] = found[target][0]
+        return matrix
@@ -8,17 +8,85 @@ Create Date: 2024/3/13
 """
 
 import json
+from typing import Callable
 from indoorspace import IndoorSpace
+from instrumentation import phase
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+COLLECTIONS = ('cells', 'connections', 'layers', 'rlineses')
 
 
 def serialization(filepath: str, indoorspace: IndoorSpace):
-    indoorSpace_jsondata = json.dumps(indoorspace.to_json(), indent=4, ensure_ascii=False)
-    with open(filepath, 'w', encoding='utf-8') as file:
-        file.write(indoorSpace_jsondata)
-    return indoorSpace_jsondata
+    with phase('serialization') as metrics:
+        json_data = indoorspace.to_json()
+        with phase('json.dumps'):
+            indoorSpace_jsondata = json.dumps(json_data, indent=4, ensure_ascii=False)
+        with phase('write'):
+            with open(filepath, 'w', encoding='utf-8') as file:
+                file.write(indoorSpace_jsondata)
+        metrics.count('characters', len(indoorSpace_jsondata))
+        return indoorSpace_jsondata
+
+
+def deserialization(filepath: str, lazy: bool = False) -> IndoorSpace:
+    with phase('deserialization') as metrics:
+        with phase('read'):
+            with open(filepath, 'r', encoding='utf-8') as file:
+                indoorSpace_str = file.read()
+        metrics.count('characters', len(indoorSpace_str))
+        return IndoorSpace().from_json(indoorSpace_str, lazy)
+
+
+def _encoder(compact: bool, indent: int) -> Callable:
+    if compact and orjson is not None:
+        return lambda value: orjson.dumps(value).decode('utf-8')
+    if compact:
+        return lambda value: json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return lambda value: json.dumps(value, indent=indent, ensure_ascii=False)
+
+
+def stream_serialization(file, indoorspace: IndoorSpace, compact: bool = False, indent: int = 4,
+                         chunk_size: int = 1000):
+    if isinstance(file, str):
+        with open(file, 'w', encoding='utf-8') as handle:
+            return stream_serialization(handle, indoorspace, compact, indent, chunk_size)
 
+    encode = _encoder(compact, indent)
+    if compact:
+        newline = item_newline = ''
+        key_separator = ':'
+    else:
+        # nested levels are re-indented so the output matches json.dumps(..., indent=indent)
+        newline = '\n' + ' ' * indent
+        item_newline = newline + ' ' * indent
+        key_separator = ': '
+    collections = {
+        'cells': indoorspace.cells,
+        'connections': indoorspace.connections,
+        'layers': indoorspace.layers,
+        'rlineses': indoorspace.rlineses
+    }
 
-def deserialization(filepath: str) -> IndoorSpace:
-    with open(filepath, 'r', encoding='utf-8') as file:
-        indoorSpace_str = file.read()
-    return IndoorSpace().from_json(indoorSpace_str)
+    with phase('stream_serialization') as metrics:
+        file.write('{' + newline + '"properties"' + key_separator +
+                   encode(indoorspace.properties).replace('\n', newline))
+        for key in COLLECTIONS:
+            items = collections[key]
+            metrics.count(key, len(items))
+            file.write(',' + newline + json.dumps(key) + key_separator + '[')
+            if not items:
+                file.write(']')
+                continue
+            with phase(key):
+                chunk = []
+                for i, item in enumerate(items):
+                    chunk.append((',' if i else '') + item_newline + encode(item.to_json()).replace('\n', item_newline))
+                    if len(chunk) >= chunk_size:
+                        file.write(''.join(chunk))
+                        chunk = []
+                file.write(''.join(chunk) + newline + ']')
+        file.write(newline[:1] + '}')
@@ -0,0 +1,236 @@
+"""
+File Name: snapshot.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import os
+import json
+import mmap
+import tempfile
+import numpy as np
+import shapely
+from typing import List, Dict, Optional, Tuple
+from cell import Cell
+from connection import Connection
+from layer import Layer
+from rlines import Rlines
+from indoorspace import IndoorSpace
+from binary import pack, unpack, write_sections, read_sections, unpack_bytes, unpack_lists, unpack_properties
+
+SNAPSHOT_VERSION = 1
+
+
+def _sorted_order(ids: List[str]) -> np.ndarray:
+    encoded = [item.encode('utf-8') for item in ids]
+    return np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.uint32)
+
+
+def _csr(keys: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=count), out=indptr[1:])
+    return indptr, np.argsort(keys, kind='stable').astype(np.int32)
+
+
+def snapshot_sections(indoorspace: IndoorSpace) -> Dict[str, np.ndarray]:
+    sections = pack(indoorspace)
+    cells = indoorspace.cells
+    connections = indoorspace.connections
+    cell_index = {cell.id: i for i, cell in enumerate(cells)}
+    sources = np.fromiter((cell_index[c.source] for c in connections), dtype=np.int32, count=len(connections))
+    targets = np.fromiter((cell_index[c.target] for c in connections), dtype=np.int32, count=len(connections))
+
+    sections['snapshot'] = np.array([SNAPSHOT_VERSION], dtype=np.uint32)
+    sections['cells.sorted'] = _sorted_order([cell.id for cell in cells])
+    sections['connections.sorted'] = _sorted_order([connection.id for connection in connections])
+    sections['connections.source'] = sources
+    sections['connections.target'] = targets
+    sections['topology.out.indptr'], sections['topology.out.indices'] = _csr(sources, len(cells))
+    sections['topology.in.indptr'], sections['topology.in.indices'] = _csr(targets, len(cells))
+    return sections
+
+
+def write_snapshot(filepath: str, indoorspace: IndoorSpace):
+    # readers may have the old file mapped, so the new one is written aside and swapped in
+    directory = os.path.dirname(os.path.abspath(filepath))
+    handle, staging = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            write_sections(file, snapshot_sections(indoorspace))
+        os.replace(staging, filepath)
+    except BaseException:
+        if os.path.exists(staging):
+            os.remove(staging)
+        raise
+
+
+class _LazyStrings:
+
+    __slots__ = ('_snapshot',)
+
+    def __init__(self, snapshot: 'Snapshot'):
+        self._snapshot = snapshot
+
+    def __getitem__(self, index: int) -> str:
+        return self._snapshot._string(index)
+
+
+class Snapshot:
+
+    def __init__(self, sections: Dict[str, np.ndarray], mapping: Optional[mmap.mmap] = None):
+        if 'snapshot' not in sections:
+            raise ValueError('Binary IndoorJSON file is not a snapshot')
+        version = int(sections['snapshot'][0])
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f'Unsupported snapshot version {version}')
+        self._sections = sections
+        self._mapping = mapping
+        self._string_offsets = sections['strings.offsets']
+        self._string_data = sections['strings.data']
+
+    @classmethod
+    def open(cls, filepath: str) -> 'Snapshot':
+        with open(filepath, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(read_sections(mapping), mapping)
+
+    def close(self):
+        self._sections = self._string_offsets = self._string_data = None
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # arrays handed out by this snapshot still reference the mapping
+                pass
+            self._mapping = None
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    @property
+    def sections(self) -> Dict[str, np.ndarray]:
+        return self._sections
+
+    @property
+    def properties(self) -> Dict:
+        return json.loads(self._sections['properties'].tobytes())
+
+    @property
+    def cell_count(self) -> int:
+        return len(self._sections['cells.id'])
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._sections['connections.id'])
+
+    @property
+    def sources(self) -> np.ndarray:
+        return self._sections['connections.source']
+
+    @property
+    def targets(self) -> np.ndarray:
+        return self._sections['connections.target']
+
+    def _string_bytes(self, index: int) -> bytes:
+        return self._string_data[int(self._string_offsets[index]):int(self._string_offsets[index + 1])].tobytes()
+
+    def _string(self, index: int) -> str:
+        return self._string_bytes(index).decode('utf-8')
+
+    def _find(self, collection: str, element_id: str) -> int:
+        key = element_id.encode('utf-8')
+        ids = self._sections[collection + '.id']
+        order = self._sections[collection + '.sorted']
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._string_bytes(int(ids[order[middle]])) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self._string_bytes(int(ids[order[low]])) == key:
+            return int(order[low])
+        return -1
+
+    def cell_index(self, cell_id: str) -> int:
+        return self._find('cells', cell_id)
+
+    def connection_index(self, connection_id: str) -> int:
+        return self._find('connections', connection_id)
+
+    def cell_id(self, index: int) -> str:
+        return self._string(int(self._sections['cells.id'][index]))
+
+    def connection_id(self, index: int) -> str:
+        return self._string(int(self._sections['connections.id'][index]))
+
+    def _wkb(self, name: str, index: int) -> bytes:
+        offsets = self._sections[name + '.offsets']
+        return self._sections[name + '.data'][int(offsets[index]):int(offsets[index + 1])].tobytes()
+
+    def _properties(self, prefix: str, index: int) -> Dict:
+        strings = _LazyStrings(self)
+        return unpack_properties(self._sections, prefix, strings, np.array([index]))[0]
+
+    def cell(self, index: int) -> Cell:
+        # geometry stays as WKB until the cell's space or node is first read
+        return Cell.unchecked(self.cell_id(index), self._properties('cells', index),
+                              self._wkb('cells.space', index), self._wkb('cells.node', index))
+
+    def connection(self, index: int) -> Connection:
+        return Connection.unchecked(self.connection_id(index), self._properties('connections', index),
+                                    self.cell_id(self.sources[index]), self.cell_id(self.targets[index]),
+                                    self._wkb('connections.bound', index), self._wkb('connections.edge', index))
+
+    def get_cell_from_id(self, cell_id: str) -> Optional[Cell]:
+        index = self.cell_index(cell_id)
+        return None if index < 0 else self.cell(index)
+
+    def get_connection_from_id(self, connection_id: str) -> Optional[Connection]:
+        index = self.connection_index(connection_id)
+        return None if index < 0 else self.connection(index)
+
+    def cell_spaces(self, indices: np.ndarray) -> np.ndarray:
+        indices = np.asarray(indices, dtype=np.int64)
+        return shapely.from_wkb(np.array(unpack_bytes(self._sections['cells.space.offsets'],
+                                                      self._sections['cells.space.data'], indices), dtype=object))
+
+    def out_connections(self, index: int) -> np.ndarray:
+        indptr = self._sections['topology.out.indptr']
+        return self._sections['topology.out.indices'][indptr[index]:indptr[index + 1]]
+
+    def in_connections(self, index: int) -> np.ndarray:
+        indptr = self._sections['topology.in.indptr']
+        return self._sections['topology.in.indices'][indptr[index]:indptr[index + 1]]
+
+    def successors(self, index: int) -> np.ndarray:
+        return self.targets[self.out_connections(index)]
+
+    def predecessors(self, index: int) -> np.ndarray:
+        return self.sources[self.in_connections(index)]
+
+    def layers(self) -> List[Layer]:
+        strings = _LazyStrings(self)
+        ids = [strings[index] for index in self._sections['layers.id'].tolist()]
+        cells = unpack_lists(self._sections['layers.cells.offsets'], self._sections['layers.cells.data'], strings)
+        return [Layer.unchecked(layer_id, members) for layer_id, members in zip(ids, cells)]
+
+    def rlineses(self) -> List[Rlines]:
+        strings = _LazyStrings(self)
+        sections = self._sections
+        ids = [strings[index] for index in sections['rlineses.id'].tolist()]
+        cells = [strings[index] for index in sections['rlineses.cell'].tolist()]
+        ins = unpack_lists(sections['rlineses.ins.offsets'], sections['rlineses.ins.data'], strings)
+        outs = unpack_lists(sections['rlineses.outs.offsets'], sections['rlineses.outs.data'], strings)
+        closures = [json.loads(item) for item in unpack_bytes(sections['rlineses.closure.offsets'],
+                                                              sections['rlineses.closure.data'])]
+        return [Rlines.unchecked(*rlines) for rlines in zip(ids, cells, ins, outs, closures)]
+
+    def to_indoorspace(self, lazy: bool = True, layer_ids: Optional[List[str]] = None) -> IndoorSpace:
+        return unpack(self._sections, lazy, trusted=True, layer_ids=layer_ids)
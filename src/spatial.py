@@ -0,0 +1,80 @@
+"""
+File Name: spatial.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry import box
+from shapely.geometry.base import BaseGeometry
+from typing import List, Union, Sequence, Optional
+
+Point = Union[BaseGeometry, Sequence[float]]
+
+
+def as_point(point: Point) -> BaseGeometry:
+    if isinstance(point, BaseGeometry):
+        return point
+    return shapely.points(point)
+
+
+class SpatialIndex:
+
+    def __init__(self, geometries: List[BaseGeometry]):
+        self._geometries = np.empty(len(geometries), dtype=object)
+        self._geometries[:] = geometries
+        self._tree = STRtree(self._geometries)
+        # the tree never returns empty or missing geometries, so nearest() can find at most this many
+        self._searchable = int(np.count_nonzero(~(shapely.is_empty(self._geometries) |
+                                                  shapely.is_missing(self._geometries))))
+        if len(geometries):
+            minx, miny, maxx, maxy = shapely.total_bounds(self._geometries)
+            self._spacing = max(maxx - minx, maxy - miny) / np.sqrt(len(geometries)) or 1.0
+        else:
+            self._spacing = 1.0
+
+    @property
+    def geometries(self) -> np.ndarray:
+        return self._geometries
+
+    def __len__(self) -> int:
+        return len(self._geometries)
+
+    def query_point(self, point: Point) -> np.ndarray:
+        return np.sort(self._tree.query(as_point(point), predicate='intersects'))
+
+    def query_points(self, points: np.ndarray) -> np.ndarray:
+        points = shapely.points(np.asarray(points, dtype=float).reshape(-1, 2))
+        result = np.full(len(points), -1, dtype=np.int64)
+        inputs, matches = self._tree.query(points, predicate='intersects')
+        order = np.lexsort((matches, inputs))
+        inputs, first = np.unique(inputs[order], return_index=True)
+        result[inputs] = matches[order][first]
+        return result
+
+    def query_window(self, minx: float, miny: float, maxx: float, maxy: float) -> np.ndarray:
+        return np.sort(self._tree.query(box(minx, miny, maxx, maxy), predicate='intersects'))
+
+    def query_pairs(self, predicate: Optional[str] = None) -> np.ndarray:
+        left, right = self._tree.query(self._geometries, predicate=predicate)
+        keep = left < right
+        return np.column_stack((left[keep], right[keep]))
+
+    def nearest(self, point: Point, k: int = 1) -> np.ndarray:
+        k = min(k, self._searchable)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        point = as_point(point)
+        _, distances = self._tree.query_nearest(point, return_distance=True)
+        radius = max(distances[0], self._spacing)
+        while True:
+            candidates = self._tree.query(point, predicate='dwithin', distance=radius)
+            if len(candidates) >= k:
+                break
+            radius *= 2
+        distances = shapely.distance(self._geometries[candidates], point)
+        return candidates[np.lexsort((candidates, distances))[:k]]
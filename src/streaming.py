@@ -0,0 +1,239 @@
+"""
+File Name: streaming.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import os
+import json
+import re
+import threading
+from typing import Iterator, Tuple, Any, List, Optional, Set, Callable
+from cell import Cell
+from connection import Connection
+from layer import Layer
+from rlines import Rlines
+from indoorspace import IndoorSpace
+from cancellation import LoadCancelled
+
+CHUNK_SIZE = 1 << 20
+
+MAX_VALUE_SIZE = 1 << 26
+
+COLLECTIONS = {
+    'cells': Cell,
+    'connections': Connection,
+    'layers': Layer,
+    'rlineses': Rlines
+}
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _WatchedFile:
+
+    def __init__(self, file, progress: Optional[Callable[[int, int], None]], cancel: Optional[threading.Event],
+                 base: int, total: int):
+        self._file = file
+        self._progress = progress
+        self._cancel = cancel
+        self._base = base
+        self._total = total
+
+    def read(self, size: int = -1) -> str:
+        if self._cancel is not None and self._cancel.is_set():
+            raise LoadCancelled('Loading was cancelled')
+        chunk = self._file.read(size)
+        if self._progress is not None:
+            # the binary buffer position counts bytes, which the text position does not
+            self._progress(self._base + self._file.buffer.tell(), self._total)
+        return chunk
+
+
+class _JsonReader:
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE, max_value_size: int = MAX_VALUE_SIZE):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._decoder = json.JSONDecoder()
+        self._buffer: str = ''
+        self._pos: int = 0
+        self._eof: bool = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        if not chunk:
+            self._eof = True
+        return bool(chunk)
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in IndoorJSON stream")
+        self._pos += 1
+
+    def _refill(self) -> bool:
+        # a corrupt or truncated document would otherwise be buffered whole before failing
+        if len(self._buffer) - self._pos > self._max_value_size:
+            raise ValueError(f'IndoorJSON value exceeds {self._max_value_size} characters')
+        return self._fill()
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._refill():
+                    continue
+                raise
+            # a value touching the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._refill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json(file, chunk_size: int = CHUNK_SIZE, max_value_size: int = MAX_VALUE_SIZE) -> Iterator[Tuple[str, Any]]:
+    reader = _JsonReader(file, chunk_size, max_value_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key in COLLECTIONS and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() != ']':
+                while True:
+                    yield key, reader.value()
+                    if reader.peek() != ',':
+                        break
+                    reader.expect(',')
+            reader.expect(']')
+        else:
+            yield key, reader.value()
+        if reader.peek() != ',':
+            break
+        reader.expect(',')
+    reader.expect('}')
+
+
+def _from_json(key: str, item, lazy: bool):
+    if lazy and key in ('cells', 'connections'):
+        return COLLECTIONS[key].from_json(item, lazy=True)
+    return COLLECTIONS[key].from_json(item)
+
+
+def iter_objects(filepath: str, collection: str, chunk_size: int = CHUNK_SIZE, lazy: bool = False) -> Iterator:
+    with open(filepath, 'r', encoding='utf-8') as file:
+        for key, item in iter_json(file, chunk_size):
+            if key == collection:
+                yield _from_json(key, item, lazy)
+
+
+def iter_cells(filepath: str, chunk_size: int = CHUNK_SIZE, lazy: bool = False) -> Iterator[Cell]:
+    return iter_objects(filepath, 'cells', chunk_size, lazy)
+
+
+def iter_connections(filepath: str, chunk_size: int = CHUNK_SIZE, lazy: bool = False) -> Iterator[Connection]:
+    return iter_objects(filepath, 'connections', chunk_size, lazy)
+
+
+def iter_layers(filepath: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Layer]:
+    return iter_objects(filepath, 'layers', chunk_size)
+
+
+def iter_rlineses(filepath: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Rlines]:
+    return iter_objects(filepath, 'rlineses', chunk_size)
+
+
+def _layer_cells(file, layer_ids: List[str], chunk_size: int, max_value_size: int) -> Set[str]:
+    layers = {}
+    for key, item in iter_json(file, chunk_size, max_value_size):
+        if key == 'layers' and item['$id'] in layer_ids:
+            layers[item['$id']] = item['cells']
+    missing = [layer_id for layer_id in layer_ids if layer_id not in layers]
+    if missing:
+        raise ValueError('Layer id does not exist: ' + ', '.join(map(str, missing)))
+    return {cell_id for cells in layers.values() for cell_id in cells}
+
+
+def stream_deserialization(filepath: str, chunk_size: int = CHUNK_SIZE, lazy: bool = False,
+                           layer_ids: Optional[List[str]] = None,
+                           progress: Optional[Callable[[int, int], None]] = None,
+                           cancel: Optional[threading.Event] = None,
+                           max_value_size: int = MAX_VALUE_SIZE) -> IndoorSpace:
+    """
+    Build an IndoorSpace from an IndoorJSON file one element at a time.
+
+    "cells" must come before "connections" in the document. With layer_ids, "connections" must also come
+    before "rlineses", so that rlines can drop the stubs. A ValueError is raised if the order is broken,
+    or if a single value grows beyond max_value_size characters.
+    """
+    indoorSpace = IndoorSpace()
+    adders = {
+        'cells': indoorSpace.add_cell,
+        'connections': indoorSpace.add_connection,
+        'layers': indoorSpace.set_layers,
+        'rlineses': indoorSpace.set_rlineses
+    }
+    passes = 1 if layer_ids is None else 2
+    size = os.path.getsize(filepath) if progress is not None else 0
+
+    def watched(file, index: int):
+        if progress is None and cancel is None:
+            return file
+        return _WatchedFile(file, progress, cancel, index * size, passes * size)
+
+    # layers follow the cells in the document, so a layer selection needs a first pass over the layers
+    selected = stub_ids = None
+    if layer_ids is not None:
+        with open(filepath, 'r', encoding='utf-8') as file:
+            selected = _layer_cells(watched(file, 0), layer_ids, chunk_size, max_value_size)
+    with open(filepath, 'r', encoding='utf-8') as file:
+        seen = set()
+        for key, item in iter_json(watched(file, passes - 1), chunk_size, max_value_size):
+            if key == 'connections' and selected is None and 'cells' not in seen:
+                raise ValueError('Streaming IndoorJSON requires "cells" before "connections"')
+            if key == 'connections' and selected is not None and 'rlineses' in seen:
+                raise ValueError('Streaming IndoorJSON with layer_ids requires "connections" before "rlineses"')
+            seen.add(key)
+            if key == 'properties':
+                indoorSpace.set_properties(item)
+            elif key not in COLLECTIONS:
+                continue
+            elif selected is None:
+                adders[key](_from_json(key, item, lazy))
+            elif key == 'cells':
+                if item['$id'] in selected:
+                    indoorSpace.add_cell(_from_json(key, item, lazy))
+            elif key == 'connections':
+                inside = (item['fr'] in selected) + (item['to'] in selected)
+                if inside == 2:
+                    indoorSpace.add_connection(_from_json(key, item, lazy))
+                elif inside == 1:
+                    indoorSpace.add_stub(_from_json(key, item, lazy))
+            elif key == 'layers':
+                if item['$id'] in layer_ids:
+                    indoorSpace.set_layers(_from_json(key, item, lazy))
+            elif item['cell'] in selected:
+                if stub_ids is None:
+                    stub_ids = {stub.id for stub in indoorSpace.stubs}
+                indoorSpace.set_rlineses(_from_json(key, item, lazy).without(stub_ids))
+    return indoorSpace
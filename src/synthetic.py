@@ -0,0 +1,129 @@
+"""
+File Name: synthetic.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import math
+import numpy as np
+import shapely
+from typing import List, Dict, Tuple
+from cell import Cell
+from connection import Connection
+from layer import Layer
+from turns import generate_rlineses
+from indoorspace import IndoorSpace
+
+
+class _Plan:
+
+    def __init__(self):
+        self.cell_ids: List[str] = []
+        self.cell_properties: List[Dict] = []
+        self.boxes: List[Tuple[float, float, float, float]] = []
+        self.links: List[Tuple[int, int]] = []
+        self.bounds: List[Tuple[Tuple[float, float], Tuple[float, float]]] = []
+        self.link_types: List[str] = []
+        self.layers: List[Tuple[str, List[str]]] = []
+
+    def cell(self, cell_id: str, properties: Dict, minx: float, miny: float, maxx: float, maxy: float) -> int:
+        self.cell_ids.append(cell_id)
+        self.cell_properties.append(properties)
+        self.boxes.append((minx, miny, maxx, maxy))
+        return len(self.cell_ids) - 1
+
+    def link(self, fr: int, to: int, bound, link_type: str):
+        self.links.append((fr, to))
+        self.bounds.append(bound)
+        self.link_types.append(link_type)
+
+    def build(self, properties: Dict, rlines: bool) -> IndoorSpace:
+        boxes = np.asarray(self.boxes, dtype=float).reshape(-1, 4)
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+        spaces = shapely.box(boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3])
+        nodes = shapely.points(centers)
+
+        # every opening is walkable both ways, so each link becomes a connection pair
+        links = np.asarray(self.links, dtype=np.int64).reshape(-1, 2)
+        links = np.concatenate((links, links[:, ::-1]))
+        bounds = shapely.linestrings(np.asarray(self.bounds, dtype=float).reshape(-1, 2, 2))
+        bounds = np.concatenate((bounds, bounds))
+        edges = shapely.linestrings(np.stack((centers[links[:, 0]], centers[links[:, 1]]), axis=1))
+        link_types = self.link_types + self.link_types
+
+        indoorSpace = IndoorSpace()
+        indoorSpace.set_properties(properties)
+        for cell_id, cell_properties, space, node in zip(self.cell_ids, self.cell_properties, spaces, nodes):
+            indoorSpace.add_cell(Cell(cell_id, cell_properties, space, node))
+        for (fr, to), bound, edge, link_type in zip(links.tolist(), bounds, edges, link_types):
+            connection_id = f'{self.cell_ids[fr]}-{self.cell_ids[to]}'
+            indoorSpace.add_connection(Connection(connection_id, {'type': link_type}, self.cell_ids[fr],
+                                                  self.cell_ids[to], bound, edge))
+        for layer_id, cell_ids in self.layers:
+            indoorSpace.set_layers(Layer(layer_id, cell_ids))
+        if rlines:
+            # u-turns through a cell are closed, every other in/out pair stays open
+            for rlines in generate_rlineses(indoorSpace, close_u_turns=True):
+                indoorSpace.set_rlineses(rlines)
+        return indoorSpace
+
+
+def grid_building(rows: int, cols: int, floors: int = 1, rlines: bool = True) -> IndoorSpace:
+    plan = _Plan()
+    for floor in range(floors):
+        # floors are laid side by side so that every space stays disjoint in 2D
+        offset = floor * cols
+        first = len(plan.cell_ids)
+        for row in range(rows):
+            for col in range(cols):
+                x = offset + col
+                plan.cell(f'f{floor}r{row}c{col}', {'floor': floor, 'roomNumber': f'{floor}-{row}-{col}'},
+                          x, row, x + 1, row + 1)
+        for row in range(rows):
+            for col in range(cols):
+                x = offset + col
+                index = first + row * cols + col
+                if col + 1 < cols:
+                    plan.link(index, index + 1, ((x + 1, row), (x + 1, row + 1)), 'door')
+                if row + 1 < rows:
+                    plan.link(index, index + cols, ((x, row + 1), (x + 1, row + 1)), 'door')
+        if floor:
+            plan.link(first - rows * cols + cols - 1, first, ((offset, 0), (offset, 1)), 'stairs')
+        plan.layers.append((f'floor{floor}', plan.cell_ids[first:]))
+    return plan.build({'name': f'grid {rows}x{cols}x{floors}', 'generator': 'synthetic'}, rlines)
+
+
+def corridor_building(rooms: int, floors: int = 1, rlines: bool = True) -> IndoorSpace:
+    plan = _Plan()
+    segments = max(1, math.ceil(rooms / 2))
+    corridor = []
+    for floor in range(floors):
+        offset = floor * segments
+        first = len(plan.cell_ids)
+        for segment in range(segments):
+            x = offset + segment
+            corridor.append(plan.cell(f'f{floor}s{segment}', {'floor': floor, 'type': 'corridor'}, x, 0, x + 1, 1))
+            if segment:
+                plan.link(corridor[-2], corridor[-1], ((x, 0), (x, 1)), 'opening')
+            for side, (low, high, wall) in enumerate(((1, 3, 1), (-2, 0, 0))):
+                if 2 * segment + side < rooms:
+                    room = plan.cell(f'f{floor}s{segment}r{side}', {'floor': floor, 'type': 'room'},
+                                     x, low, x + 1, high)
+                    plan.link(corridor[-1], room, ((x + 0.25, wall), (x + 0.75, wall)), 'door')
+        if floor:
+            plan.link(corridor[-segments - 1], corridor[-segments], ((offset, 0), (offset, 1)), 'stairs')
+        plan.layers.append((f'floor{floor}', plan.cell_ids[first:]))
+    return plan.build({'name': f'corridor {rooms}x{floors}', 'generator': 'synthetic'}, rlines)
+
+
+def synthetic_building(cells: int, kind: str = 'grid', floors: int = 1, rlines: bool = True) -> IndoorSpace:
+    per_floor = max(1, math.ceil(cells / floors))
+    if kind == 'grid':
+        rows = max(1, int(math.sqrt(per_floor)))
+        return grid_building(rows, math.ceil(per_floor / rows), floors, rlines)
+    if kind == 'corridor':
+        # a corridor segment and its two rooms make three cells
+        return corridor_building(max(1, per_floor * 2 // 3), floors, rlines)
+    raise ValueError('Unknown building kind: ' + str(kind))
@@ -0,0 +1,134 @@
+"""
+File Name: turns.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+from typing import List, Dict, Tuple
+from rlines import Rlines
+
+
+def _topology(indoorspace) -> Tuple[Dict[str, int], Dict[str, int], np.ndarray, np.ndarray]:
+    cell_index = {cell.id: i for i, cell in enumerate(indoorspace.cells)}
+    connections = indoorspace.connections
+    connection_index = {connection.id: i for i, connection in enumerate(connections)}
+    sources = np.fromiter((cell_index[c.source] for c in connections), dtype=np.int64, count=len(connections))
+    targets = np.fromiter((cell_index[c.target] for c in connections), dtype=np.int64, count=len(connections))
+    return cell_index, connection_index, sources, targets
+
+
+def _grouped(keys: np.ndarray, members: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    members = members[np.argsort(keys[members], kind='stable')]
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys[members], minlength=count), out=indptr[1:])
+    return indptr, members
+
+
+def _incidence(cell_count: int, sources: np.ndarray, targets: np.ndarray) -> Tuple:
+    # as in the hypergraph, a self-loop only enters its cell
+    everything = np.arange(len(sources))
+    in_indptr, ins = _grouped(targets, everything, cell_count)
+    out_indptr, outs = _grouped(sources, everything[sources != targets], cell_count)
+    return in_indptr, ins, out_indptr, outs
+
+
+def _closures(indoorspace, connection_index: Dict[str, int]) -> Dict[int, List[Tuple[int, int]]]:
+    closures: Dict[int, List[Tuple[int, int]]] = {}
+    for rlines in indoorspace.rlineses:
+        for pair in rlines.closure:
+            if isinstance(pair, (list, tuple)) and len(pair) == 2 \
+                    and pair[0] in connection_index and pair[1] in connection_index:
+                closures.setdefault(connection_index[pair[0]], []).append(connection_index[pair[1]])
+    return closures
+
+
+def generate_rlineses(indoorspace, close_u_turns: bool = False, id_prefix: str = 'rlines-') -> List[Rlines]:
+    cells = indoorspace.cells
+    connections = indoorspace.connections
+    _, connection_index, sources, targets = _topology(indoorspace)
+    in_indptr, ins, out_indptr, outs = _incidence(len(cells), sources, targets)
+    closures = _closures(indoorspace, connection_index)
+    in_indptr, out_indptr = in_indptr.tolist(), out_indptr.tolist()
+    ins, outs, sources, targets = ins.tolist(), outs.tolist(), sources.tolist(), targets.tolist()
+
+    rlineses = []
+    for i, cell in enumerate(cells):
+        cell_ins = ins[in_indptr[i]:in_indptr[i + 1]]
+        cell_outs = outs[out_indptr[i]:out_indptr[i + 1]]
+        out_set = set(cell_outs)
+        closure = {}
+        for connection in cell_ins:
+            # existing closures are kept only where they name a real in/out pair of this cell
+            for out in closures.get(connection, ()):
+                if out in out_set:
+                    closure[(connection, out)] = None
+            if close_u_turns:
+                for out in cell_outs:
+                    if targets[out] == sources[connection]:
+                        closure[(connection, out)] = None
+        rlineses.append(Rlines.unchecked(id_prefix + cell.id, cell.id,
+                                         [connections[k].id for k in cell_ins],
+                                         [connections[k].id for k in cell_outs],
+                                         [[connections[a].id, connections[b].id] for a, b in closure]))
+    return rlineses
+
+
+class TurnTable:
+
+    def __init__(self, cell_ids: List[str], connection_ids: List[str], cells: np.ndarray, ins: np.ndarray,
+                 outs: np.ndarray, allowed: np.ndarray):
+        self._cell_ids: List[str] = cell_ids
+        self._connection_ids: List[str] = connection_ids
+        self.cells: np.ndarray = cells
+        self.ins: np.ndarray = ins
+        self.outs: np.ndarray = outs
+        self.allowed: np.ndarray = allowed
+
+    @property
+    def cell_ids(self) -> List[str]:
+        return self._cell_ids
+
+    @property
+    def connection_ids(self) -> List[str]:
+        return self._connection_ids
+
+    def __len__(self) -> int:
+        return len(self.ins)
+
+    def cell_rows(self) -> np.ndarray:
+        indptr = np.zeros(len(self._cell_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.cells, minlength=len(self._cell_ids)), out=indptr[1:])
+        return indptr
+
+    def restrictions(self) -> set:
+        closed = ~self.allowed
+        return set(zip(self.ins[closed].tolist(), self.outs[closed].tolist()))
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {'cells': self.cells, 'ins': self.ins, 'outs': self.outs, 'allowed': self.allowed}
+
+    def save(self, filepath: str):
+        np.savez(filepath, **self.to_arrays())
+
+    @classmethod
+    def build(cls, indoorspace) -> 'TurnTable':
+        _, connection_index, sources, targets = _topology(indoorspace)
+        cell_count = len(indoorspace.cells)
+        _, in_order, out_indptr, out_order = _incidence(cell_count, sources, targets)
+
+        # every connection entering a cell is paired with each connection leaving it, grouped by cell
+        counts = np.diff(out_indptr)[targets[in_order]]
+        total = int(counts.sum())
+        ins = np.repeat(in_order, counts)
+        starts = np.repeat(out_indptr[targets[in_order]] - (np.cumsum(counts) - counts), counts)
+        outs = out_order[starts + np.arange(total)] if total else np.empty(0, dtype=np.int64)
+
+        closed = [(a, b) for a, targets_of in _closures(indoorspace, connection_index).items() for b in targets_of]
+        keys = ins * len(sources) + outs
+        closed_keys = np.array([a * len(sources) + b for a, b in closed], dtype=np.int64)
+        allowed = ~np.isin(keys, closed_keys)
+        return cls([cell.id for cell in indoorspace.cells], [connection.id for connection in indoorspace.connections],
+                   targets[ins].astype(np.int32), ins.astype(np.int32), outs.astype(np.int32), allowed)
@@ -0,0 +1,133 @@
+"""
+File Name: validation.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+import shapely
+from collections import Counter
+from typing import List, Dict
+
+CHECKS = (
+    'duplicate_id',
+    'connection_endpoint',
+    'space_valid',
+    'node_in_space',
+    'bound_touches_space',
+    'space_overlap',
+    'layer_cell',
+    'rlines_cell',
+    'rlines_ins',
+    'rlines_outs',
+    'rlines_closure'
+)
+
+
+class ValidationReport:
+
+    def __init__(self):
+        self._issues: List[Dict] = []
+
+    @property
+    def issues(self) -> List[Dict]:
+        return self._issues
+
+    @property
+    def ok(self) -> bool:
+        return not self._issues
+
+    def add(self, check: str, element_id: str, message: str):
+        self._issues.append({'check': check, 'id': element_id, 'message': message})
+
+    def counts(self) -> Dict[str, int]:
+        return dict(Counter(issue['check'] for issue in self._issues))
+
+    def to_json(self) -> Dict:
+        return {'ok': self.ok, 'counts': self.counts(), 'issues': self._issues}
+
+
+def _check_duplicates(report: ValidationReport, kind: str, ids: List[str]):
+    for element_id, count in Counter(ids).items():
+        if count > 1:
+            report.add('duplicate_id', element_id, f'{kind} id is used {count} times')
+
+
+def validate(indoorspace, tolerance: float = 1e-9) -> ValidationReport:
+    report = ValidationReport()
+    cells = indoorspace.cells
+    connections = indoorspace.connections
+    cell_ids = [cell.id for cell in cells]
+    cell_index = {cell_id: i for i, cell_id in enumerate(cell_ids)}
+    _check_duplicates(report, 'Cell', cell_ids)
+    _check_duplicates(report, 'Connection', [connection.id for connection in connections])
+
+    spaces = indoorspace.get_cell_index().geometries
+    nodes = np.empty(len(cells), dtype=object)
+    nodes[:] = [cell.node for cell in cells]
+
+    for i in np.flatnonzero(~shapely.is_valid(spaces)):
+        report.add('space_valid', cell_ids[i], shapely.is_valid_reason(spaces[i]))
+    for i in np.flatnonzero(~shapely.covers(spaces, nodes)):
+        report.add('node_in_space', cell_ids[i], 'Node lies outside the cell space')
+
+    # neighbours that only share a wall have a zero-area bounding box overlap and skip the exact test
+    pairs = indoorspace.get_cell_index().query_pairs()
+    extents = shapely.bounds(spaces).reshape(-1, 4)
+    low = np.maximum(extents[pairs[:, 0], :2], extents[pairs[:, 1], :2])
+    high = np.minimum(extents[pairs[:, 0], 2:], extents[pairs[:, 1], 2:])
+    pairs = pairs[np.all(high - low > tolerance, axis=1)]
+    # interiors that meet in an area, which also catches identical and nested spaces that overlaps() misses
+    overlaps = shapely.relate_pattern(spaces[pairs[:, 0]], spaces[pairs[:, 1]], '2********')
+    for i, j in pairs[overlaps]:
+        report.add('space_overlap', cell_ids[i], f'Space overlaps cell {cell_ids[j]}')
+
+    linked = []
+    for k, connection in enumerate(connections):
+        missing = [end for end in (connection.source, connection.target) if end not in cell_index]
+        if missing:
+            report.add('connection_endpoint', connection.id, 'Unknown cell ' + ', '.join(missing))
+        else:
+            linked.append(k)
+    if linked:
+        bounds = np.empty(len(linked), dtype=object)
+        bounds[:] = [connections[k].bound for k in linked]
+        sources = np.array([cell_index[connections[k].source] for k in linked])
+        targets = np.array([cell_index[connections[k].target] for k in linked])
+        touches = shapely.dwithin(bounds, spaces[sources], tolerance) & \
+            shapely.dwithin(bounds, spaces[targets], tolerance)
+        for position in np.flatnonzero(~touches):
+            connection = connections[linked[position]]
+            report.add('bound_touches_space', connection.id,
+                       f'Bound does not touch both {connection.source} and {connection.target}')
+
+    for layer in indoorspace.layers:
+        for cell_id in layer.cells:
+            if cell_id not in cell_index:
+                report.add('layer_cell', layer.id, 'Unknown cell ' + str(cell_id))
+
+    ins: Dict[str, set] = {}
+    outs: Dict[str, set] = {}
+    # stubs of an extracted subspace still enter or leave its cells
+    for connection in connections + indoorspace.stubs:
+        ins.setdefault(connection.target, set()).add(connection.id)
+        outs.setdefault(connection.source, set()).add(connection.id)
+    for rlines in indoorspace.rlineses:
+        if rlines.cell not in cell_index:
+            report.add('rlines_cell', rlines.id, 'Unknown cell ' + str(rlines.cell))
+        cell_ins = ins.get(rlines.cell, set())
+        cell_outs = outs.get(rlines.cell, set())
+        for connection_id in rlines.ins:
+            if connection_id not in cell_ins:
+                report.add('rlines_ins', rlines.id, f'{connection_id} does not enter cell {rlines.cell}')
+        for connection_id in rlines.outs:
+            if connection_id not in cell_outs:
+                report.add('rlines_outs', rlines.id, f'{connection_id} does not leave cell {rlines.cell}')
+        for pair in rlines.closure:
+            if not isinstance(pair, (list, tuple)) or len(pair) != 2 \
+                    or pair[0] not in cell_ins or pair[1] not in cell_outs:
+                report.add('rlines_closure', rlines.id, f'{pair} is not an in/out pair of cell {rlines.cell}')
+
+    return report
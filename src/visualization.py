@@ -7,15 +7,19 @@ Author: Ziwei Xiang <knightzz1016@gmail.com>
 Create Date: 2024/4/18
 """
 
+import math
+import numpy as np
+import shapely
 import plotly.graph_objs as go
 from plotly.offline import plot
 from shapely import geometry as geo
-from shapely.wkt import loads
+from typing import Tuple, Optional
 
 from indoorspace import IndoorSpace
+from instrumentation import phase
 
 
-def graph_visualize(indoorSpace: IndoorSpace, filename: str = 'graph.html'):
+def _graph_figure(indoorSpace: IndoorSpace) -> go.Figure:
     fig = go.Figure()
 
     for cell in indoorSpace.cells:
@@ -65,19 +69,20 @@ def graph_visualize(indoorSpace: IndoorSpace, filename: str = 'graph.html'):
 
     fig.update_layout(showlegend=False)
 
-    plot(fig, filename=filename)
+    return fig
 
 
-def hypergraph_visualize(indoorSpace: IndoorSpace, filename: str = 'hypergraph.html'):
+def _hypergraph_figure(indoorSpace: IndoorSpace) -> go.Figure:
     fig = go.Figure()
 
     hypergraph = indoorSpace.get_hypergraph()
+    centroids = indoorSpace.bound_centroids()
+    connection_index = {connection.id: i for i, connection in enumerate(indoorSpace.connections)}
+    turns = indoorSpace.get_turn_table()
+    rows = turns.cell_rows().tolist()
+    ins, outs, allowed = turns.ins.tolist(), turns.outs.tolist(), turns.allowed.tolist()
 
-    for hyperEdge in hypergraph['hyperEdges']:
-        cell = indoorSpace.get_cell_from_id(hyperEdge['id'])
-        ins = hyperEdge['inner_nodeset']['ins']
-        outs = hyperEdge['inner_nodeset']['outs']
-        rlines = []
+    for i, cell in enumerate(indoorSpace.cells):
         rlines_group = geo.Polygon(cell.space)
 
         x_rlinesGroup, y_rlinesGroup = rlines_group.exterior.xy
@@ -92,34 +97,10 @@ def hypergraph_visualize(indoorSpace: IndoorSpace, filename: str = 'hypergraph.h
                        text=str(cell.properties),
                        hoverinfo='text'))
 
-        for ins_id in ins:
-            insConnectionPoint = indoorSpace.get_connection_from_id(
-                ins_id).bound.centroid
-
-            for outs_id in outs:
-                outsConnectionPoint = indoorSpace.get_connection_from_id(
-                    outs_id).bound.centroid
-                rline = geo.LineString(
-                    [insConnectionPoint, outsConnectionPoint])
-                rlines.append(rline)
-
-        if 'closure' in hyperEdge:
-            rlines_closure = hyperEdge['closure']
-            for rlines_pairs in rlines_closure:
-                insConnectionPoint = indoorSpace.get_connection_from_id(
-                    rlines_pairs[0]).bound.centroid
-                outsConnectionPoint = indoorSpace.get_connection_from_id(
-                    rlines_pairs[1]).bound.centroid
-                rline_closure = geo.LineString(
-                    [insConnectionPoint, outsConnectionPoint])
-
-                for rline in rlines:
-                    if rline == rline_closure:
-                        rlines.remove(rline)
-                        break
-
-        for rline in rlines:
-            x_rline, y_rline = rline.xy
+        for row in range(rows[i], rows[i + 1]):
+            if not allowed[row]:
+                continue
+            x_rline, y_rline = zip(centroids[ins[row]], centroids[outs[row]])
             fig.add_trace(
                 go.Scatter(x=list(x_rline),
                            y=list(y_rline),
@@ -128,12 +109,11 @@ def hypergraph_visualize(indoorSpace: IndoorSpace, filename: str = 'hypergraph.h
                            name='Rline'))
 
     for hyperNode in hypergraph['hyperNodes']:
-        connectionPoint = loads(hyperNode['bound'])
-        x_hyperNode, y_hyperNode = geo.LineString(connectionPoint).centroid.xy
+        x_hyperNode, y_hyperNode = centroids[connection_index[hyperNode['$id']]]
 
         fig.add_trace(
-            go.Scatter(x=list(x_hyperNode),
-                       y=list(y_hyperNode),
+            go.Scatter(x=[x_hyperNode],
+                       y=[y_hyperNode],
                        mode='markers',
                        marker=dict(size=10, color='#81B3A9'),
                        name='Connection Point',
@@ -142,4 +122,134 @@ def hypergraph_visualize(indoorSpace: IndoorSpace, filename: str = 'hypergraph.h
 
     fig.update_layout(showlegend=False)
 
-    plot(fig, filename=filename)
+    return fig
+
+
+def _coordinates(geometries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # one NaN row after every geometry breaks the line, so a single trace can draw them all
+    coordinates, index = shapely.get_coordinates(geometries, return_index=True)
+    xy = np.full((len(coordinates) + len(geometries), 2), np.nan)
+    xy[np.arange(len(coordinates)) + index] = coordinates
+    return xy[:, 0], xy[:, 1]
+
+
+def _segments(starts: np.ndarray, ends: np.ndarray, max_lines: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    # rlines through the same pair of doors in opposite directions draw the same segment
+    swap = (starts[:, 0] > ends[:, 0]) | ((starts[:, 0] == ends[:, 0]) & (starts[:, 1] > ends[:, 1]))
+    segments = np.where(swap[:, None, None], np.stack((ends, starts), axis=1), np.stack((starts, ends), axis=1))
+    segments = np.unique(segments.reshape(-1, 4), axis=0).reshape(-1, 2, 2)
+    segments = segments[_decimate(len(segments), max_lines)]
+    xy = np.full((len(segments), 3, 2), np.nan)
+    xy[:, :2] = segments
+    xy = xy.reshape(-1, 2)
+    return xy[:, 0], xy[:, 1]
+
+
+def _distinct(geometries: np.ndarray) -> np.ndarray:
+    # a two-way door stores the same bound and the reversed edge twice
+    _, first = np.unique(shapely.to_wkb(shapely.normalize(geometries)), return_index=True)
+    return geometries[np.sort(first)]
+
+
+def _decimate(count: int, limit: Optional[int]) -> np.ndarray:
+    if limit is None or count <= limit:
+        return np.arange(count)
+    return np.arange(0, count, math.ceil(count / max(limit, 1)))
+
+
+def _outlines(indoorSpace: IndoorSpace, tolerance: float) -> np.ndarray:
+    outlines = shapely.get_exterior_ring(indoorSpace.get_cell_index().geometries)
+    if tolerance > 0:
+        outlines = shapely.simplify(outlines, tolerance, preserve_topology=False)
+    return outlines
+
+
+def _markers(points: np.ndarray, texts: list, max_markers: Optional[int], name: str) -> go.Scattergl:
+    keep = _decimate(len(points), max_markers)
+    points = points[keep].reshape(-1, 2)
+    return go.Scattergl(x=points[:, 0], y=points[:, 1], mode='markers', marker=dict(size=10, color='#81B3A9'),
+                        name=name, text=np.array([str(texts[i]) for i in keep]), hoverinfo='text')
+
+
+def _batched_graph_figure(indoorSpace: IndoorSpace, tolerance: float, max_markers: Optional[int],
+                          max_lines: Optional[int]) -> go.Figure:
+    connections = indoorSpace.connections
+    bounds = indoorSpace.get_connection_index().geometries
+    edges = np.empty(len(connections), dtype=object)
+    edges[:] = [connection.edge for connection in connections]
+    nodes = shapely.get_coordinates([cell.node for cell in indoorSpace.cells])
+
+    x1, y1 = _coordinates(_outlines(indoorSpace, tolerance))
+    x2, y2 = _coordinates(_distinct(bounds))
+    edges = _distinct(edges)
+    x3, y3 = _coordinates(edges[_decimate(len(edges), max_lines)])
+    fig = go.Figure([
+        go.Scattergl(x=x1, y=y1, fill='toself', fillcolor='#C1DDDB', line=dict(color='#81B3A9', width=2),
+                     name='Space', hoverinfo='skip'),
+        go.Scattergl(x=x2, y=y2, mode='lines', line=dict(color='#81B3A9', width=2), name='Boundary',
+                     hoverinfo='skip'),
+        go.Scattergl(x=x3, y=y3, mode='lines', line=dict(color='#81B3A9', width=2), name='Edge',
+                     hoverinfo='skip'),
+        _markers(nodes, [cell.properties for cell in indoorSpace.cells], max_markers, 'Cell')
+    ])
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def _batched_hypergraph_figure(indoorSpace: IndoorSpace, tolerance: float, max_markers: Optional[int],
+                               max_lines: Optional[int]) -> go.Figure:
+    hypergraph = indoorSpace.get_hypergraph()
+    points = indoorSpace.bound_centroids()
+
+    turns = indoorSpace.get_turn_table()
+    ins_indices, outs_indices = turns.ins[turns.allowed], turns.outs[turns.allowed]
+
+    x1, y1 = _coordinates(_outlines(indoorSpace, tolerance))
+    x2, y2 = _segments(points[ins_indices].reshape(-1, 2), points[outs_indices].reshape(-1, 2), max_lines)
+    fig = go.Figure([
+        go.Scattergl(x=x1, y=y1, fill='toself', fillcolor='#C1DDDB', line=dict(color='#81B3A9', width=2),
+                     name='Rline Group', hoverinfo='skip'),
+        go.Scattergl(x=x2, y=y2, mode='lines', line=dict(color='#81B3A9'), name='Rline', hoverinfo='skip'),
+        _markers(points, [hyperNode['properties'] for hyperNode in hypergraph['hyperNodes']], max_markers,
+                 'Connection Point')
+    ])
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def graph_figure(indoorSpace: IndoorSpace, batched: bool = False, tolerance: float = 0.0,
+                 max_markers: Optional[int] = None, max_lines: Optional[int] = None) -> go.Figure:
+    if batched:
+        return _batched_graph_figure(indoorSpace, tolerance, max_markers, max_lines)
+    return _graph_figure(indoorSpace)
+
+
+def hypergraph_figure(indoorSpace: IndoorSpace, batched: bool = False, tolerance: float = 0.0,
+                      max_markers: Optional[int] = None, max_lines: Optional[int] = None) -> go.Figure:
+    if batched:
+        return _batched_hypergraph_figure(indoorSpace, tolerance, max_markers, max_lines)
+    return _hypergraph_figure(indoorSpace)
+
+
+def graph_visualize(indoorSpace: IndoorSpace, filename: str = 'graph.html', auto_open: bool = True,
+                    batched: bool = False, tolerance: float = 0.0, max_markers: Optional[int] = None,
+                    max_lines: Optional[int] = None):
+    with phase('graph_visualize') as metrics:
+        metrics.count('cells', len(indoorSpace.cells))
+        metrics.count('connections', len(indoorSpace.connections))
+        with phase('traces'):
+            fig = graph_figure(indoorSpace, batched, tolerance, max_markers, max_lines)
+        with phase('plot'):
+            plot(fig, filename=filename, auto_open=auto_open)
+
+
+def hypergraph_visualize(indoorSpace: IndoorSpace, filename: str = 'hypergraph.html', auto_open: bool = True,
+                         batched: bool = False, tolerance: float = 0.0, max_markers: Optional[int] = None,
+                         max_lines: Optional[int] = None):
+    with phase('hypergraph_visualize') as metrics:
+        metrics.count('cells', len(indoorSpace.cells))
+        metrics.count('connections', len(indoorSpace.connections))
+        with phase('traces'):
+            fig = hypergraph_figure(indoorSpace, batched, tolerance, max_markers, max_lines)
+        with phase('plot'):
+            plot(fig, filename=filename, auto_open=auto_open)
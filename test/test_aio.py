@@ -0,0 +1,124 @@
+"""
+File Name: test_aio.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import sys
+import os
+import json
+import asyncio
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath('../src'))
+
+from aio import deserialization_async, from_json_async, LiveIndoorSpace, _on_loop
+from serialization import serialization, deserialization
+from cancellation import LoadCancelled
+from synthetic import grid_building
+
+
+class TestAio(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.directory.name, 'building.json')
+        serialization(self.filepath, grid_building(10, 10, floors=3))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_deserialization_async(self):
+        reports = []
+        indoorSpace = asyncio.run(deserialization_async(self.filepath, progress=lambda done, total:
+                                                        reports.append((done, total)), chunk_size=4096))
+        self.assertEqual(json.dumps(indoorSpace.to_json()), json.dumps(deserialization(self.filepath).to_json()))
+        self.assertGreater(len(reports), 1)
+        self.assertEqual(reports[-1][0], os.path.getsize(self.filepath))
+        self.assertEqual(reports[-1][1], os.path.getsize(self.filepath))
+
+        indoorSpace = asyncio.run(deserialization_async(self.filepath, layer_ids=['floor1']))
+        self.assertEqual(len(indoorSpace.cells), 100)
+
+        with open(self.filepath, 'r', encoding='utf-8') as file:
+            json_str = file.read()
+        reports = []
+        indoorSpace = asyncio.run(from_json_async(json_str, progress=lambda done, total:
+                                                  reports.append((done, total))))
+        self.assertEqual(len(indoorSpace.cells), 300)
+        self.assertEqual(reports[-1], (7, 7))
+
+    def test_cancellation(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(LoadCancelled):
+            asyncio.run(deserialization_async(self.filepath, cancel=cancel))
+        with self.assertRaises(LoadCancelled):
+            asyncio.run(from_json_async('{"cells": []}', cancel=cancel))
+
+        async def cancelled():
+            cancel = threading.Event()
+            task = asyncio.ensure_future(deserialization_async(self.filepath, cancel=cancel, chunk_size=1024))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return cancel
+
+        self.assertTrue(asyncio.run(cancelled()).is_set())
+
+    def test_cancel_with_progress(self):
+        futures = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                future = super().submit(*args, **kwargs)
+                futures.append(future)
+                return future
+
+        executor = RecordingExecutor(max_workers=1)
+
+        async def cancelled():
+            first_report = asyncio.Event()
+            task = asyncio.ensure_future(deserialization_async(self.filepath, chunk_size=256, executor=executor,
+                                                               progress=lambda done, total: first_report.set()))
+            await first_report.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return _on_loop(lambda done, total: None, threading.Event())
+
+        # the loop is closed while the worker may still be reading, and late reports must not reach it
+        post = asyncio.run(cancelled())
+        post(1, 2)
+        executor.shutdown(wait=True)
+        error = futures[0].exception()
+        self.assertTrue(error is None or isinstance(error, LoadCancelled), error)
+
+    def test_reload(self):
+        async def reloads():
+            live = LiveIndoorSpace()
+            prepared = []
+            indoorSpace = await live.reload(self.filepath, prepare=lambda space: prepared.append(space.get_router()))
+            self.assertIs(live.current, indoorSpace)
+            self.assertFalse(live.loading)
+            self.assertEqual(len(prepared), 1)
+
+            first = asyncio.ensure_future(live.reload(self.filepath))
+            await asyncio.sleep(0)
+            second = await live.reload(self.filepath, layer_ids=['floor0'])
+            with self.assertRaises(LoadCancelled):
+                await first
+            self.assertIs(live.current, second)
+            self.assertEqual(len(second.cells), 100)
+
+        asyncio.run(reloads())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+File Name: test_batch.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import json
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath('../src'))
+
+from batch import batch_convert, batch_deserialization
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_convert(self):
+
+        with open('example.json', 'r') as file:
+            original_json = json.load(file)
+
+        with tempfile.TemporaryDirectory() as directory:
+            broken = os.path.join(directory, 'broken.json')
+            with open(broken, 'w') as file:
+                file.write('{"cells": [')
+
+            results = {os.path.basename(result.filepath): result
+                       for result in batch_convert(['example.json', broken], directory, 'binary', processes=2)}
+            self.assertTrue(results['example.json'].ok)
+            self.assertFalse(results['broken.json'].ok)
+
+            loaded = list(batch_deserialization([results['example.json'].output], processes=1))
+            self.assertEqual(loaded[0].cells, 3)
+            self.assertEqual(loaded[0].indoorspace.to_json(), original_json)
+
+    def test_convert_output_clashes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first, second = (os.path.join(directory, name, 'model.json') for name in ('a', 'b'))
+            for filepath in (first, second):
+                os.makedirs(os.path.dirname(filepath))
+                with open('example.json', 'r') as source, open(filepath, 'w') as file:
+                    file.write(source.read())
+
+            with self.assertRaises(ValueError):
+                batch_convert([first, second], directory, 'binary', processes=1)
+            with self.assertRaises(ValueError):
+                batch_convert([first], os.path.join(directory, 'a'), 'json', processes=1)
+            self.assertEqual(sorted(os.listdir(directory)), ['a', 'b'])
+            self.assertEqual(os.listdir(os.path.join(directory, 'a')), ['model.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
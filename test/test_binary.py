@@ -0,0 +1,58 @@
+"""
+File Name: test_binary.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import json
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath('../src'))
+
+from serialization import deserialization
+from binary import binary_serialization, binary_deserialization
+from synthetic import grid_building
+
+
+class TestBinary(unittest.TestCase):
+
+    def test_round_trip(self):
+
+        with open('example.json', 'r') as file:
+            original_json = json.load(file)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'example.ijb')
+            binary_serialization(filepath, deserialization('example.json'))
+            indoorSpace = binary_deserialization(filepath)
+            lazyIndoorSpace = binary_deserialization(filepath, lazy=True)
+            trustedIndoorSpace = binary_deserialization(filepath, trusted=True)
+
+        self.assertEqual(original_json, indoorSpace.to_json())
+        self.assertEqual(original_json, lazyIndoorSpace.to_json())
+        self.assertEqual(original_json, trustedIndoorSpace.to_json())
+        self.assertEqual(indoorSpace.get_connection_from_id('conn3-1').target, 'c1')
+        self.assertEqual(lazyIndoorSpace.get_cell_from_id('c2').node.x, 1.5)
+
+    def test_layer_deserialization(self):
+        indoorSpace = grid_building(2, 3, floors=3)
+        expected = indoorSpace.subspace(['floor1'])
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'grid.ijb')
+            binary_serialization(filepath, indoorSpace)
+            subspace = binary_deserialization(filepath, layer_ids=['floor1'])
+            lazySubspace = binary_deserialization(filepath, lazy=True, layer_ids=['floor1'])
+            with self.assertRaises(ValueError):
+                binary_deserialization(filepath, layer_ids=['roof'])
+        self.assertEqual(expected.to_json(), subspace.to_json())
+        self.assertEqual(expected.to_json(), lazySubspace.to_json())
+        self.assertEqual([stub.id for stub in expected.stubs], [stub.id for stub in subspace.stubs])
+
+
+if __name__ == '__main__':
+    unittest.main()
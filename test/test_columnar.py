@@ -0,0 +1,43 @@
+"""
+File Name: test_columnar.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import json
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath('../src'))
+
+from serialization import deserialization
+from columnar import ColumnarSpace
+
+
+class TestColumnar(unittest.TestCase):
+
+    def test_round_trip(self):
+
+        with open('example.json', 'r') as file:
+            original_json = json.load(file)
+
+        columnarSpace = ColumnarSpace.from_indoorspace(deserialization('example.json'))
+
+        self.assertEqual(original_json, columnarSpace.to_json())
+        self.assertEqual(original_json, columnarSpace.to_indoorspace().to_json())
+
+    def test_queries(self):
+        columnarSpace = ColumnarSpace.from_indoorspace(deserialization('example.json'))
+
+        self.assertEqual(columnarSpace.out_degrees().tolist(), [1, 0, 1])
+        self.assertEqual(columnarSpace.in_degrees().tolist(), [1, 1, 0])
+        self.assertEqual(columnarSpace.get_connection_from_id('conn3-1').source, 'c3')
+        self.assertEqual(columnarSpace.incident_connections('c1').tolist(), [0, 1])
+        self.assertEqual(columnarSpace.cells_containing(1.5, 0.5).tolist(), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -30,6 +30,20 @@ class TestDeserialization(unittest.TestCase):
 
         self.assertEqual(original_json, generated_json)
 
+    def test_lazy_deserialization(self):
+
+        with open('example.json', 'r') as file:
+            original_json = json.load(file)
+
+        indoorSpace = deserialization('example.json', lazy=True)
+
+        self.assertEqual(original_json, indoorSpace.to_json())
+
+        cell = indoorSpace.get_cell_from_id('c1')
+        self.assertEqual(cell.space.area, 1.0)
+        self.assertEqual(cell.to_json(), original_json['cells'][0])
+        self.assertEqual(indoorSpace.get_connection_from_id('conn1-2').edge.length, 1.0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,196 @@
+"""
+File Name: test_indoorspace.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import sys
+import os
+import json
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath('../src'))
+
+from shapely.geometry import Point, Polygon, LineString
+from cell import Cell
+from connection import Connection
+from rlines import Rlines
+from indoorspace import IndoorSpace
+from spatial import SpatialIndex
+from serialization import deserialization
+from synthetic import grid_building
+from validation import validate
+
+
+class TestIndoorSpace(unittest.TestCase):
+
+    def setUp(self):
+        self.indoorSpace = IndoorSpace()
+        self.indoorSpace.add_cell(Cell('c1', {}, Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]), Point(0.5, 0.5)))
+        self.indoorSpace.add_cell(Cell('c2', {}, Polygon([(1, 0), (2, 0), (2, 1), (1, 1)]), Point(1.5, 0.5)))
+        self.indoorSpace.add_connection(Connection('conn1-2', {}, 'c1', 'c2', LineString([(1, 0), (1, 1)]),
+                                                   LineString([(0.5, 0.5), (1.5, 0.5)])))
+
+    def test_index(self):
+        self.assertIs(self.indoorSpace.get_cell_from_id('c2'), self.indoorSpace.cells[1])
+        self.assertIs(self.indoorSpace.get_connection_from_id('conn1-2'), self.indoorSpace.connections[0])
+        self.assertIsNone(self.indoorSpace.get_cell_from_id('c3'))
+
+        with self.assertRaises(ValueError):
+            self.indoorSpace.add_cell(Cell('c1', {}, Polygon([(0, 0), (1, 0), (1, 1)]), Point(0.5, 0.5)))
+        with self.assertRaises(ValueError):
+            self.indoorSpace.add_connection(Connection('conn1-3', {}, 'c1', 'c3', LineString([(0, 0), (1, 1)]),
+                                                       LineString([(0, 0), (1, 1)])))
+
+    def test_remove(self):
+        with self.assertRaises(ValueError):
+            self.indoorSpace.remove_cell('c1')
+
+        self.indoorSpace.remove_connection('conn1-2')
+        self.indoorSpace.remove_cell('c1')
+        self.assertEqual([cell.id for cell in self.indoorSpace.cells], ['c2'])
+        self.assertEqual(self.indoorSpace.connections, [])
+        self.assertIsNone(self.indoorSpace.get_cell_from_id('c1'))
+        self.assertIsNone(self.indoorSpace.get_connection_from_id('conn1-2'))
+
+    def test_incident_matrix(self):
+        indoorSpace = deserialization('example.json')
+        dense = indoorSpace.get_incident_matrix(sparse=False)
+        self.assertEqual(dense.tolist(), [[1, -1], [-1, 0], [0, 1]])
+
+        incident_matrix = indoorSpace.get_incident_matrix()
+        if isinstance(incident_matrix, tuple):
+            rows, cols, data = incident_matrix
+            incident_matrix = np.zeros(dense.shape, dtype=int)
+            incident_matrix[rows, cols] = data
+        else:
+            incident_matrix = incident_matrix.toarray()
+        self.assertTrue(np.array_equal(incident_matrix, dense))
+
+        hypergraph_matrix = indoorSpace.get_hypergraph_incidence_matrix(sparse=False)
+        self.assertTrue(np.array_equal(hypergraph_matrix, dense.T))
+
+    def test_hypergraph(self):
+        indoorSpace = deserialization('example.json')
+        hypergraph = indoorSpace.get_hypergraph()
+
+        self.assertEqual([hyperNode['$id'] for hyperNode in hypergraph['hyperNodes']], ['conn1-2', 'conn3-1'])
+        hyperEdges = {hyperEdge['id']: hyperEdge for hyperEdge in hypergraph['hyperEdges']}
+        self.assertEqual(hyperEdges['c1']['inner_nodeset'], {'ins': ['conn3-1'], 'outs': ['conn1-2']})
+        self.assertEqual(hyperEdges['c2']['inner_nodeset'], {'ins': ['conn1-2'], 'outs': []})
+        self.assertEqual(hyperEdges['c3']['inner_nodeset'], {'ins': [], 'outs': ['conn3-1']})
+        self.assertEqual(hyperEdges['c1']['closure'], [])
+        self.assertNotIn('closure', hyperEdges['c2'])
+        self.assertEqual(hyperEdges['c3']['space'], 'POLYGON ((0 1, 1 1, 1 2, 0 2, 0 1))')
+
+    def test_incremental_hypergraph(self):
+        indoorSpace = deserialization('example.json')
+        hypergraph = indoorSpace.get_hypergraph()
+        version = indoorSpace.version
+        self.assertIs(indoorSpace.get_hypergraph(), hypergraph)
+        self.assertEqual(indoorSpace.version, version)
+
+        indoorSpace.add_cell(Cell('c4', {}, Polygon([(1, 1), (2, 1), (2, 2), (1, 2)]), Point(1.5, 1.5)))
+        indoorSpace.add_connection(Connection('conn2-4', {}, 'c2', 'c4', LineString([(1, 1), (2, 1)]),
+                                              LineString([(1.5, 0.5), (1.5, 1.5)])))
+        indoorSpace.set_rlineses(Rlines('rlines2', 'c2', ['conn1-2'], ['conn2-4'], [['conn1-2', 'conn2-4']]))
+        indoorSpace.remove_connection('conn3-1')
+        indoorSpace.remove_rlines('rlines1')
+        self.assertGreater(indoorSpace.version, version)
+
+        incremental = indoorSpace.get_hypergraph()
+        self.assertIs(incremental, hypergraph)
+        indoorSpace.set_hypergraph({})
+        self.assertEqual(incremental, indoorSpace.get_hypergraph())
+
+    def test_bulk_removal(self):
+        indoorSpace = grid_building(3, 3)
+        hypergraph = indoorSpace.get_hypergraph()
+        removed = [connection.id for connection in indoorSpace.connections
+                   if 'f0r1c1' in (connection.source, connection.target)]
+        for connection_id in removed:
+            indoorSpace.remove_connection(connection_id)
+        indoorSpace.remove_cell('f0r1c1')
+        indoorSpace.add_cell(Cell('extra', {}, Polygon([(5, 5), (6, 5), (6, 6), (5, 6)]), Point(5.5, 5.5)))
+
+        cell_ids = [cell.id for cell in indoorSpace.cells]
+        self.assertEqual(cell_ids[-1], 'extra')
+        self.assertNotIn('f0r1c1', cell_ids)
+        self.assertEqual(len(indoorSpace.connections), 24 - len(removed))
+        incremental = indoorSpace.get_hypergraph()
+        self.assertIs(incremental, hypergraph)
+        self.assertEqual([hyperEdge['id'] for hyperEdge in incremental['hyperEdges']], cell_ids)
+        rebuilt = IndoorSpace.from_json(json.dumps(indoorSpace.to_json())).get_hypergraph()
+        self.assertEqual(json.dumps(incremental['hyperNodes']), json.dumps(rebuilt['hyperNodes']))
+        self.assertEqual([hyperEdge['inner_nodeset'] for hyperEdge in incremental['hyperEdges']],
+                         [hyperEdge['inner_nodeset'] for hyperEdge in rebuilt['hyperEdges']])
+
+    def test_spatial_queries(self):
+        indoorSpace = deserialization('example.json')
+
+        self.assertEqual([cell.id for cell in indoorSpace.locate((0.5, 1.5))], ['c3'])
+        self.assertEqual([cell.id for cell in indoorSpace.locate(Point(1, 0.5))], ['c1', 'c2'])
+        self.assertEqual(indoorSpace.locate_points(np.array([[1.5, 0.5], [5, 5], [0.2, 0.2]])).tolist(), [1, -1, 0])
+        self.assertEqual([cell.id for cell in indoorSpace.nearest_cells((3, 0.5), k=2)], ['c2', 'c1'])
+        self.assertEqual([cell.id for cell in indoorSpace.cells_in_window(0.1, 1.1, 0.2, 1.2)], ['c3'])
+        self.assertEqual(len(indoorSpace.connections_in_window(0.9, 0.4, 1.1, 0.6)), 2)
+
+        index = indoorSpace.get_cell_index()
+        self.assertIs(indoorSpace.get_cell_index(), index)
+        indoorSpace.add_cell(Cell('c4', {}, Polygon([(2, 0), (3, 0), (3, 1), (2, 1)]), Point(2.5, 0.5)))
+        self.assertEqual([cell.id for cell in indoorSpace.locate((2.5, 0.5))], ['c4'])
+
+    def test_nearest_skips_empty(self):
+        index = SpatialIndex([Point(0, 0).buffer(1), Polygon(), None])
+        self.assertEqual(index.nearest((5, 5), k=3).tolist(), [0])
+        self.assertEqual(len(SpatialIndex([Polygon()]).nearest((5, 5))), 0)
+
+    def test_from_json_index(self):
+        indoorSpace = deserialization('example.json')
+        self.assertEqual(indoorSpace.get_cell_from_id('c3').properties, {'roomNumber': '1103'})
+        self.assertEqual(indoorSpace.get_connection_from_id('conn3-1').source, 'c3')
+
+    def test_subspace(self):
+        indoorSpace = grid_building(2, 2, floors=3)
+        subspace = indoorSpace.subspace(['floor1'])
+        self.assertEqual([cell.id for cell in subspace.cells], indoorSpace.layers[1].cells)
+        self.assertEqual(len(subspace.connections), 8)
+        # the staircases to floor 0 and floor 2 stay as one-sided stubs in both directions
+        self.assertEqual(sorted(stub.id for stub in subspace.stubs),
+                         ['f0r0c1-f1r0c0', 'f1r0c0-f0r0c1', 'f1r0c1-f2r0c0', 'f2r0c0-f1r0c1'])
+        self.assertEqual([layer.id for layer in subspace.layers], ['floor1'])
+        self.assertEqual(len(subspace.rlineses), 4)
+        self.assertNotIn('stubs', subspace.to_json())
+        self.assertTrue(validate(subspace).ok)
+        # rlines drop the stubs, so the written subspace is self-contained
+        rlines = next(rlines for rlines in subspace.rlineses if rlines.cell == 'f1r0c0')
+        self.assertNotIn('f0r0c1-f1r0c0', rlines.ins)
+        self.assertTrue(validate(IndoorSpace.from_json(json.dumps(subspace.to_json()))).ok)
+        self.assertEqual(len(subspace.subspace(['floor1']).stubs), 4)
+        with self.assertRaises(ValueError):
+            indoorSpace.subspace(['roof'])
+        with self.assertRaises(ValueError):
+            subspace.remove_cell('f1r0c0')
+
+    def test_analytics(self):
+        indoorSpace = grid_building(2, 3)
+        np.testing.assert_allclose(indoorSpace.cell_areas(), np.ones(6))
+        np.testing.assert_allclose(indoorSpace.cell_centroids()[4], [1.5, 1.5])
+        np.testing.assert_allclose(indoorSpace.door_widths(), np.ones(14))
+        np.testing.assert_allclose(indoorSpace.edge_lengths(), np.ones(14))
+        np.testing.assert_allclose(indoorSpace.bound_centroids()[0], [1.0, 0.5])
+
+        areas = indoorSpace.cell_areas()
+        self.assertIs(indoorSpace.cell_areas(), areas)
+        with self.assertRaises(ValueError):
+            areas[0] = 2.0
+        indoorSpace.add_cell(Cell('extra', {}, Polygon([(5, 5), (7, 5), (7, 7), (5, 7)]), Point(6, 6)))
+        self.assertEqual(indoorSpace.cell_areas()[-1], 4.0)
+        self.assertEqual(len(areas), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
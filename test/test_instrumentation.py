@@ -0,0 +1,79 @@
+"""
+File Name: test_instrumentation.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import sys
+import os
+import unittest
+import tracemalloc
+
+sys.path.append(os.path.abspath('../src'))
+
+import instrumentation
+from serialization import deserialization
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_disabled(self):
+        self.assertFalse(instrumentation.enabled())
+        with instrumentation.phase('anything') as metrics:
+            metrics.count('items', 3)
+        self.assertIs(instrumentation.phase('other'), instrumentation.phase('anything'))
+
+    def test_deserialization_phases(self):
+        finished = []
+        with instrumentation.recording(callback=lambda phase: finished.append(phase.name)) as recorder:
+            indoorSpace = deserialization('example.json')
+            indoorSpace.get_incident_matrix()
+            indoorSpace.get_hypergraph()
+        self.assertFalse(instrumentation.enabled())
+
+        load, matrix, hypergraph = recorder.phases
+        self.assertEqual(load.name, 'deserialization')
+        self.assertEqual([child.name for child in load.children], ['read', 'from_json'])
+        from_json = load.children[1]
+        self.assertEqual(from_json.counts['cells'], len(indoorSpace.cells))
+        self.assertEqual(from_json.counts['connections'], len(indoorSpace.connections))
+        cells = next(child for child in from_json.children if child.name == 'cells')
+        self.assertEqual([child.name for child in cells.children], ['wkt', 'construct'])
+        self.assertEqual(matrix.name, 'get_incident_matrix')
+        self.assertEqual(hypergraph.counts['hyperEdges'], len(indoorSpace.cells))
+        self.assertEqual(finished[-1], 'get_hypergraph')
+
+        for phase in recorder.walk():
+            self.assertGreaterEqual(phase.seconds, 0.0)
+            self.assertGreaterEqual(phase.peak_bytes, 0)
+            for child in phase.children:
+                self.assertLessEqual(child.seconds, phase.seconds)
+        self.assertEqual(recorder.summary()['wkt']['calls'], 2)
+
+
+    def test_tracing_changes(self):
+        recorder = instrumentation.Recorder()
+        with recorder.phase('outer'):
+            recorder.start()
+            with recorder.phase('inner'):
+                bytearray(1 << 16)
+        recorder.stop()
+        outer, = recorder.phases
+        self.assertIsNone(outer.peak_bytes)
+        self.assertGreaterEqual(outer.children[0].peak_bytes, 1 << 16)
+
+        # tracing owned by someone else is left alone
+        tracemalloc.start()
+        try:
+            with instrumentation.recording() as recorder:
+                with instrumentation.phase('external'):
+                    pass
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertIsNone(recorder.phases[0].peak_bytes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+File Name: test_routing.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import math
+import sys
+import os
+import tempfile
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath('../src'))
+
+from shapely.geometry import Point, LineString, box
+from cell import Cell
+from connection import Connection
+from rlines import Rlines
+from indoorspace import IndoorSpace
+from routetable import RouteTable
+
+
+class TestRouting(unittest.TestCase):
+
+    def setUp(self):
+        # a -- b -- d with a longer detour a -- c -- d
+        nodes = {'a': (0, 0), 'b': (1, 0), 'c': (1, 2), 'd': (2, 0)}
+        self.indoorSpace = IndoorSpace()
+        for cell_id, (x, y) in nodes.items():
+            self.indoorSpace.add_cell(Cell(cell_id, {}, box(x - 0.5, y - 0.5, x + 0.5, y + 0.5), Point(x, y)))
+        for fr, to in [('a', 'b'), ('b', 'd'), ('a', 'c'), ('c', 'd'), ('d', 'a')]:
+            self.indoorSpace.add_connection(Connection(fr + to, {}, fr, to, LineString([nodes[fr], nodes[to]]),
+                                                       LineString([nodes[fr], nodes[to]])))
+
+    def test_shortest_path(self):
+        distance, cells, connections = self.indoorSpace.shortest_path('a', 'd')
+        self.assertAlmostEqual(distance, 2.0)
+        self.assertEqual(cells, ['a', 'b', 'd'])
+        self.assertEqual(connections, ['ab', 'bd'])
+
+        self.assertEqual(self.indoorSpace.shortest_path('b', 'b'), (0.0, ['b'], []))
+        self.assertEqual(self.indoorSpace.shortest_path('b', 'c')[1], ['b', 'd', 'a', 'c'])
+
+    def test_turn_restriction(self):
+        router = self.indoorSpace.get_router()
+        self.indoorSpace.set_rlineses(Rlines('rlines-b', 'b', ['ab'], ['bd'], [['ab', 'bd']]))
+        self.assertIsNot(self.indoorSpace.get_router(), router)
+
+        distance, cells, _ = self.indoorSpace.shortest_path('a', 'd')
+        self.assertAlmostEqual(distance, 2 * math.sqrt(5))
+        self.assertEqual(cells, ['a', 'c', 'd'])
+        self.assertAlmostEqual(self.indoorSpace.shortest_path('b', 'd')[0], 1.0)
+
+    def test_short_edge_between_distant_nodes(self):
+        # c's node is far off, but its edges are short, so a -> c -> t is the shortest path
+        nodes = {'a': (0, 0), 'b': (5, 5), 'c': (5, 100), 't': (10, 0)}
+        indoorSpace = IndoorSpace()
+        for cell_id, (x, y) in nodes.items():
+            indoorSpace.add_cell(Cell(cell_id, {}, box(x - 0.5, y - 0.5, x + 0.5, y + 0.5), Point(x, y)))
+        edges = {'ab': LineString([(0, 0), (10, 0)]), 'bt': LineString([(0, 0), (10, 0)]),
+                 'ac': LineString([(0, 0), (1, 0)]), 'ct': LineString([(0, 0), (1, 0)])}
+        for connection_id, edge in edges.items():
+            fr, to = connection_id
+            indoorSpace.add_connection(Connection(connection_id, {}, fr, to, LineString([nodes[fr], nodes[to]]), edge))
+
+        distance, cells, _ = indoorSpace.shortest_path('a', 't')
+        self.assertAlmostEqual(distance, 2.0)
+        self.assertEqual(cells, ['a', 'c', 't'])
+        self.assertAlmostEqual(indoorSpace.get_router().distance_matrix(['a'], ['t'])[0, 0], distance)
+
+    def test_batched_queries(self):
+        router = self.indoorSpace.get_router()
+        self.assertIs(self.indoorSpace.get_router(), router)
+
+        matrix = router.distance_matrix(['a', 'c'], ['a', 'b', 'd'])
+        self.assertEqual(matrix.shape, (2, 3))
+        self.assertAlmostEqual(matrix[0, 2], 2.0)
+        self.assertAlmostEqual(matrix[1, 1], math.sqrt(5) + 3.0)
+
+        paths = router.shortest_paths(['a', 'b'], ['d'])
+        self.assertEqual(paths[('b', 'd')][2], ['bd'])
+        self.assertEqual(paths[('a', 'd')][1], ['a', 'b', 'd'])
+
+    def test_route_table(self):
+        with tempfile.TemporaryDirectory() as directory:
+            table = RouteTable.load_or_build(self.indoorSpace, directory)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            cached = RouteTable.load_or_build(self.indoorSpace, directory)
+            self.assertIsInstance(cached.distances, np.memmap)
+
+            router = self.indoorSpace.get_router()
+            self.assertTrue(np.allclose(cached.distances, router.distance_matrix(table.cell_ids, table.cell_ids)))
+            self.assertEqual(cached.path('b', 'c'), self.indoorSpace.shortest_path('b', 'c'))
+            self.assertEqual(cached.path('c', 'c'), (0.0, ['c'], []))
+            del cached
+
+        parallel = RouteTable.build(self.indoorSpace, processes=2, chunk_size=1)
+        self.assertTrue(np.array_equal(parallel.next_hops, table.next_hops))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+File Name: test_snapshot.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import json
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath('../src'))
+
+from serialization import deserialization
+from binary import binary_serialization
+from snapshot import write_snapshot, Snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_snapshot(self):
+
+        with open('example.json', 'r') as file:
+            original_json = json.load(file)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'example.snapshot')
+            write_snapshot(filepath, deserialization('example.json'))
+
+            with Snapshot.open(filepath) as snapshot:
+                self.assertEqual(snapshot.cell_count, 3)
+                self.assertEqual(snapshot.properties, original_json['properties'])
+                self.assertEqual(snapshot.cell_index('c3'), 2)
+                self.assertEqual(snapshot.cell_index('c4'), -1)
+                self.assertIsNone(snapshot.get_connection_from_id('conn9'))
+
+                cell = snapshot.get_cell_from_id('c2')
+                self.assertEqual(cell.to_json(), original_json['cells'][1])
+                connection = snapshot.get_connection_from_id('conn3-1')
+                self.assertEqual(connection.to_json(), original_json['connections'][-1])
+
+                c1 = snapshot.cell_index('c1')
+                self.assertEqual(sorted(snapshot.connection_id(i) for i in snapshot.in_connections(c1)),
+                                 sorted(c['$id'] for c in original_json['connections'] if c['to'] == 'c1'))
+                self.assertEqual(sorted(snapshot.cell_id(i) for i in snapshot.successors(c1)),
+                                 sorted(c['to'] for c in original_json['connections'] if c['fr'] == 'c1'))
+                self.assertEqual(snapshot.cell_spaces([0, 2])[1].wkt, original_json['cells'][2]['space'])
+                self.assertEqual([layer.to_json() for layer in snapshot.layers()], original_json['layers'])
+                self.assertEqual(original_json, snapshot.to_indoorspace().to_json())
+
+                # replacing the file leaves the mapped snapshot readable
+                write_snapshot(filepath, deserialization('example.json'))
+                self.assertEqual(snapshot.cell_id(0), 'c1')
+
+            binary = os.path.join(directory, 'example.ijb')
+            binary_serialization(binary, deserialization('example.json'))
+            with self.assertRaises(ValueError):
+                Snapshot.open(binary)
+
+
+if __name__ == '__main__':
+    unittest.main()
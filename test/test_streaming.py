@@ -0,0 +1,86 @@
+"""
+File Name: test_streaming.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import json
+import sys
+import os
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath('../src'))
+
+from serialization import serialization, deserialization, stream_serialization
+from streaming import stream_deserialization, iter_cells, iter_rlineses
+from synthetic import grid_building
+
+
+class TestStreaming(unittest.TestCase):
+
+    def test_stream_deserialization(self):
+
+        with open('example.json', 'r') as file:
+            original_json = json.load(file)
+
+        for chunk_size in (1, 7, 1 << 20):
+            indoorSpace = stream_deserialization('example.json', chunk_size)
+            self.assertEqual(original_json, indoorSpace.to_json())
+            self.assertEqual(indoorSpace.get_cell_from_id('c2').properties, {'roomNumber': '1102'})
+
+    def test_iterators(self):
+        self.assertEqual([cell.id for cell in iter_cells('example.json', 16)], ['c1', 'c2', 'c3'])
+        self.assertEqual([rlines.cell for rlines in iter_rlineses('test_deserialization.json', 16)], ['c1'])
+
+    def test_layer_deserialization(self):
+        indoorSpace = grid_building(2, 3, floors=3)
+        expected = indoorSpace.subspace(['floor2', 'floor0'])
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'grid.json')
+            serialization(filepath, indoorSpace)
+            subspace = stream_deserialization(filepath, 64, layer_ids=['floor2', 'floor0'])
+            with self.assertRaises(ValueError):
+                stream_deserialization(filepath, layer_ids=['roof'])
+        self.assertEqual(expected.to_json(), subspace.to_json())
+        self.assertEqual([stub.id for stub in expected.stubs], [stub.id for stub in subspace.stubs])
+
+    def test_malformed_documents(self):
+        with open('example.json', 'r') as file:
+            original_json = json.load(file)
+        reordered = {key: original_json[key] for key in ('properties', 'connections', 'cells', 'layers', 'rlineses')}
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'reordered.json')
+            with open(filepath, 'w') as file:
+                json.dump(reordered, file)
+            with self.assertRaisesRegex(ValueError, '"cells" before "connections"'):
+                stream_deserialization(filepath)
+
+            filepath = os.path.join(directory, 'truncated.json')
+            with open(filepath, 'w') as file:
+                file.write('{"properties": {"name": "' + 'x' * 10000)
+            with self.assertRaisesRegex(ValueError, 'exceeds 1000 characters'):
+                stream_deserialization(filepath, 64, max_value_size=1000)
+
+    def test_stream_serialization(self):
+        indoorSpace = deserialization('example.json')
+
+        with tempfile.TemporaryDirectory() as directory:
+            expected = serialization(os.path.join(directory, 'expected.json'), indoorSpace)
+            for compact in (False, True):
+                filepath = os.path.join(directory, 'streamed.json')
+                stream_serialization(filepath, indoorSpace, compact=compact, chunk_size=1)
+                with open(filepath, 'r', encoding='utf-8') as file:
+                    streamed = file.read()
+                if compact:
+                    self.assertEqual(json.loads(streamed), json.loads(expected))
+                    self.assertNotIn('\n', streamed)
+                else:
+                    self.assertEqual(streamed, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+File Name: test_synthetic.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath('../src'))
+
+from synthetic import grid_building, corridor_building, synthetic_building
+from validation import validate
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def test_grid_building(self):
+        indoorSpace = grid_building(3, 4, floors=2)
+        self.assertEqual(len(indoorSpace.cells), 24)
+        # 17 neighbour pairs per floor and one staircase, each walkable both ways
+        self.assertEqual(len(indoorSpace.connections), 2 * (2 * 17 + 1))
+        self.assertEqual([layer.id for layer in indoorSpace.layers], ['floor0', 'floor1'])
+        self.assertEqual(len(indoorSpace.rlineses), 24)
+        self.assertTrue(validate(indoorSpace).ok)
+
+    def test_corridor_building(self):
+        indoorSpace = corridor_building(5, floors=2)
+        self.assertEqual(len(indoorSpace.cells), 16)
+        self.assertTrue(validate(indoorSpace).ok)
+        distance, cells, _ = indoorSpace.shortest_path('f0s0r0', 'f1s2r0')
+        self.assertEqual(cells[0], 'f0s0r0')
+        self.assertEqual(cells[-1], 'f1s2r0')
+
+    def test_synthetic_building(self):
+        self.assertGreaterEqual(len(synthetic_building(1000).cells), 1000)
+        self.assertEqual(len(synthetic_building(300, 'corridor').cells), 300)
+        with self.assertRaises(ValueError):
+            synthetic_building(10, 'tower')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+File Name: test_turns.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import sys
+import os
+import unittest
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.abspath('../src'))
+
+from serialization import deserialization
+from synthetic import grid_building
+from turns import generate_rlineses, TurnTable
+
+
+class TestTurns(unittest.TestCase):
+
+    def test_generate_rlineses(self):
+        indoorSpace = deserialization('example.json')
+        rlineses = generate_rlineses(indoorSpace)
+        self.assertEqual([rlines.cell for rlines in rlineses], [cell.id for cell in indoorSpace.cells])
+        hyperEdges = {hyperEdge['id']: hyperEdge for hyperEdge in indoorSpace.get_hypergraph()['hyperEdges']}
+        for rlines in rlineses:
+            self.assertEqual(sorted(rlines.ins), sorted(hyperEdges[rlines.cell]['inner_nodeset']['ins']))
+            self.assertEqual(sorted(rlines.outs), sorted(hyperEdges[rlines.cell]['inner_nodeset']['outs']))
+            for pair in rlines.closure:
+                self.assertIn(pair[0], rlines.ins)
+                self.assertIn(pair[1], rlines.outs)
+
+    def test_u_turns(self):
+        indoorSpace = grid_building(2, 2, rlines=False)
+        rlineses = {rlines.cell: rlines for rlines in generate_rlineses(indoorSpace, close_u_turns=True)}
+        self.assertEqual(rlineses['f0r0c0'].closure,
+                         [['f0r0c1-f0r0c0', 'f0r0c0-f0r0c1'], ['f0r1c0-f0r0c0', 'f0r0c0-f0r1c0']])
+
+    def test_turn_table(self):
+        indoorSpace = grid_building(3, 3)
+        table = indoorSpace.get_turn_table()
+        self.assertIs(table, indoorSpace.get_turn_table())
+        self.assertEqual(table.ins.dtype, np.int32)
+        expected = {(a, b) for rlines in indoorSpace.rlineses for a in rlines.ins for b in rlines.outs}
+        connection_ids = table.connection_ids
+        rows = {(connection_ids[a], connection_ids[b]): allowed
+                for a, b, allowed in zip(table.ins.tolist(), table.outs.tolist(), table.allowed.tolist())}
+        self.assertEqual(set(rows), expected)
+        closed = {tuple(pair) for rlines in indoorSpace.rlineses for pair in rlines.closure}
+        self.assertEqual({pair for pair, allowed in rows.items() if not allowed}, closed)
+        self.assertEqual(table.restrictions(), indoorSpace.get_router().restrictions)
+        self.assertTrue(np.all(np.diff(table.cells) >= 0))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'turns.npz')
+            table.save(filepath)
+            with np.load(filepath) as arrays:
+                np.testing.assert_array_equal(arrays['allowed'], table.allowed)
+
+    def test_empty(self):
+        indoorSpace = grid_building(1, 1)
+        self.assertEqual(len(TurnTable.build(indoorSpace)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
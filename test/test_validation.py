@@ -0,0 +1,59 @@
+"""
+File Name: test_validation.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.abspath('../src'))
+
+from shapely.geometry import Point, LineString, box
+from cell import Cell
+from connection import Connection
+from layer import Layer
+from rlines import Rlines
+from indoorspace import IndoorSpace
+from serialization import deserialization
+from validation import validate
+
+
+class TestValidation(unittest.TestCase):
+
+    def test_example_is_valid(self):
+        report = validate(deserialization('example.json'))
+        self.assertTrue(report.ok)
+        self.assertEqual(report.to_json(), {'ok': True, 'counts': {}, 'issues': []})
+
+    def test_issues(self):
+        indoorSpace = deserialization('example.json')
+        indoorSpace.add_cell(Cell('c4', {}, box(0.5, 0.5, 1.5, 1.5), Point(5, 5)))
+        indoorSpace.add_connection(Connection('conn2-4', {}, 'c2', 'c4', LineString([(3, 3), (4, 4)]),
+                                              LineString([(1.5, 0.5), (1, 1)])))
+        indoorSpace.set_layers(Layer('floor', ['c1', 'c9']))
+        indoorSpace.set_rlineses(Rlines('rlines2', 'c2', ['conn1-2'], ['conn3-1'], [['conn1-2', 'conn2-4'], 'x']))
+
+        report = validate(indoorSpace)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.counts(), {'node_in_space': 1, 'space_overlap': 3, 'bound_touches_space': 1,
+                                           'layer_cell': 1, 'rlines_outs': 1, 'rlines_closure': 1})
+        self.assertIn({'check': 'layer_cell', 'id': 'floor', 'message': 'Unknown cell c9'}, report.issues)
+
+    def test_contained_spaces(self):
+        indoorSpace = IndoorSpace()
+        indoorSpace.add_cell(Cell('a', {}, box(0, 0, 2, 2), Point(1, 1)))
+        indoorSpace.add_cell(Cell('b', {}, box(0, 0, 2, 2), Point(1, 1)))
+        indoorSpace.add_cell(Cell('c', {}, box(0.5, 0.5, 1.5, 1.5), Point(1, 1)))
+        indoorSpace.add_cell(Cell('d', {}, box(2, 0, 4, 2), Point(3, 1)))
+
+        report = validate(indoorSpace)
+        self.assertEqual(report.counts(), {'space_overlap': 3})
+        self.assertEqual({issue['id'] for issue in report.issues}, {'a', 'b'})
+
+
+if __name__ == '__main__':
+    unittest.main()
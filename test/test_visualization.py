@@ -0,0 +1,61 @@
+"""
+File Name: test_visualization.py
+
+Copyright (c) 2026 IndoorJson
+
+Create Date: 2026/10/18
+"""
+
+import sys
+import os
+import math
+import unittest
+
+sys.path.append(os.path.abspath('../src'))
+
+from serialization import deserialization
+from synthetic import grid_building
+from visualization import graph_figure, hypergraph_figure
+
+
+def segments(traces):
+    result = set()
+    for trace in traces:
+        xs, ys = list(trace.x), list(trace.y)
+        points = []
+        for x, y in zip(xs + [math.nan], ys + [math.nan]):
+            if x is None or math.isnan(x):
+                if len(points) == 2:
+                    result.add(tuple(sorted(points)))
+                points = []
+            else:
+                points.append((round(x, 9), round(y, 9)))
+    return result
+
+
+class TestVisualization(unittest.TestCase):
+
+    def test_batched_graph(self):
+        indoorSpace = grid_building(3, 3)
+        figure = graph_figure(indoorSpace, batched=True)
+        self.assertEqual([trace.name for trace in figure.data], ['Space', 'Boundary', 'Edge', 'Cell'])
+        self.assertEqual(len(figure.data[3].x), 9)
+        # every door is drawn once although it is stored in both directions
+        self.assertEqual(len(segments([figure.data[1]])), 12)
+        self.assertEqual(segments([figure.data[2]]),
+                         segments(trace for trace in graph_figure(indoorSpace).data if trace.name == 'Edge'))
+
+        decimated = graph_figure(indoorSpace, batched=True, max_markers=4, max_lines=5)
+        self.assertEqual(len(decimated.data[3].x), 3)
+        self.assertEqual(len(segments([decimated.data[2]])), 4)
+
+    def test_batched_hypergraph_matches_legacy(self):
+        indoorSpace = deserialization('example.json')
+        legacy = segments(trace for trace in hypergraph_figure(indoorSpace).data if trace.name == 'Rline')
+        batched = hypergraph_figure(indoorSpace, batched=True)
+        self.assertEqual(len(batched.data), 3)
+        self.assertEqual(segments([batched.data[1]]), legacy)
+
+
+if __name__ == '__main__':
+    unittest.main()